@@ -1,9 +1,14 @@
 import pygame
 import random
 from enum import Enum
-from collections import Counter
+from collections import OrderedDict
 import os
+import sys
 import math
+import time
+
+from shop_optimizer import ShopOptimizer
+from worker import WORKER_RESULT, BackgroundWorker
 
 # Card suits and ranks
 class Suit(Enum):
@@ -11,6 +16,19 @@ class Suit(Enum):
     DIAMONDS = "♦"
     CLUBS = "♣"
     SPADES = "♠"
+    # Only in custom decks, see DeckSpec
+    STARS = "★"
+    MOONS = "☾"
+
+STANDARD_SUITS = [Suit.HEARTS, Suit.DIAMONDS, Suit.CLUBS, Suit.SPADES]
+SUITS = list(Suit)  # Card code order
+SUIT_INDEX = {suit: i for i, suit in enumerate(SUITS)}
+SUIT_LETTERS = {Suit.HEARTS: "H", Suit.DIAMONDS: "D", Suit.CLUBS: "C", Suit.SPADES: "S",
+                Suit.STARS: "T", Suit.MOONS: "M"}
+
+RANKS = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
+RANK_VALUES = {'2':2, '3':3, '4':4, '5':5, '6':6, '7':7, '8':8,
+               '9':9, '10':10, 'J':11, 'Q':12, 'K':13, 'A':14}
 
 class HandType(Enum):
     HIGH_CARD = ("High Card", 10, 1)
@@ -23,6 +41,9 @@ class HandType(Enum):
     FOUR_OF_A_KIND = ("Four of a Kind", 60, 7)
     STRAIGHT_FLUSH = ("Straight Flush", 100, 8)
     ROYAL_FLUSH = ("Royal Flush", 100, 10)
+    # Only possible with more than one deck
+    FIVE_OF_A_KIND = ("Five of a Kind", 120, 12)
+    FLUSH_FIVE = ("Flush Five", 160, 16)
 
     def __init__(self, label, chips, mult):
         self.label = label
@@ -37,8 +58,7 @@ class Card:
         self.is_joker = is_joker
         self.selected = False
         # Convert rank to numeric value for comparison
-        self.value = {'2':2, '3':3, '4':4, '5':5, '6':6, '7':7, '8':8, 
-                     '9':9, '10':10, 'J':11, 'Q':12, 'K':13, 'A':14}.get(rank, 0)
+        self.value = RANK_VALUES.get(rank, 0)
     
     def __str__(self):
         return "🃏" if self.is_joker else f"{self.rank}{self.suit.value}"
@@ -46,18 +66,61 @@ class Card:
     def get_display_str(self):
         if self.is_joker:
             return "JKR"
-        suit_symbols = {
-            Suit.HEARTS: "H",
-            Suit.DIAMONDS: "D",
-            Suit.CLUBS: "C",
-            Suit.SPADES: "S"
-        }
-        return f"{self.rank}{suit_symbols[self.suit]}"
+        return f"{self.rank}{SUIT_LETTERS[self.suit]}"
 
     def get_chip_value(self):
         # Return numeric value for calculating additional chips
         return self.value
 
+    def get_code(self):
+        # Compact id, suit-major: 0-51 for the standard suits, extra suits come after
+        return SUIT_INDEX[self.suit] * len(RANKS) + RANKS.index(self.rank)
+
+def card_from_code(code):
+    return Card(SUITS[code // len(RANKS)], RANKS[code % len(RANKS)])
+
+class DeckSpec:
+    """What create_deck builds: `decks` copies of the standard deck minus removed_ranks, plus extra_suits"""
+
+    def __init__(self, decks=1, removed_ranks=(), extra_suits=()):
+        if decks < 1:
+            raise ValueError("A deck spec needs at least one deck")
+        for rank in removed_ranks:
+            if rank not in RANKS:
+                raise ValueError(f"Unknown rank {rank!r}")
+        for suit in extra_suits:
+            if suit in STANDARD_SUITS:
+                raise ValueError(f"{suit.name} is already in the standard deck")
+        self.decks = decks
+        self.ranks = [rank for rank in RANKS if rank not in removed_ranks]
+        self.suits = STANDARD_SUITS + [suit for suit in SUITS if suit in extra_suits]
+        if not self.ranks:
+            raise ValueError("A deck spec needs at least one rank")
+
+    @classmethod
+    def from_args(cls, decks=1, removed_ranks="", extra_suits=""):
+        """From command line strings such as removed_ranks '2,3' and extra_suits 'stars,moons'"""
+        try:
+            suits = [Suit[name.strip().upper()] for name in extra_suits.split(",") if name.strip()]
+        except KeyError as e:
+            raise ValueError(f"Unknown suit {e}") from None
+        return cls(decks, [rank.strip().upper() for rank in removed_ranks.split(",") if rank.strip()], suits)
+
+    def to_args(self):
+        """The from_args keyword arguments that make this spec again, for saving it"""
+        return {
+            "decks": self.decks,
+            "removed_ranks": ",".join(rank for rank in RANKS if rank not in self.ranks),
+            "extra_suits": ",".join(suit.name for suit in self.suits if suit not in STANDARD_SUITS),
+        }
+
+    def is_standard(self):
+        """One plain 52-card deck, the only kind the precomputed hand table covers"""
+        return self.decks == 1 and len(self.ranks) == len(RANKS) and self.suits == STANDARD_SUITS
+
+    def __repr__(self):
+        return f"DeckSpec(decks={self.decks}, ranks={self.ranks}, suits={[suit.name for suit in self.suits]})"
+
 class JokerType(Enum):
     STEEL = ("Steel Joker", "Adds +2 to base multiplier")
     GLASS = ("Glass Joker", "x4 multiplier but breaks after use")
@@ -110,13 +173,345 @@ class Joker:
                     card.value += 1
         return hand
 
+def count_cards(cards):
+    """Rank counts indexed by card value and suit counts indexed by SUIT_INDEX, jokers left out"""
+    rank_counts = [0] * 15
+    suit_counts = [0] * len(SUITS)
+    for card in cards:
+        if not card.is_joker:
+            rank_counts[card.value] += 1
+            suit_counts[SUIT_INDEX[card.suit]] += 1
+    return rank_counts, suit_counts
+
+def evaluate_counts(rank_counts, suit_counts):
+    """Evaluate a hand from its count vectors, returns (hand_type, scoring card chips, scoring card count).
+
+    Only looks at the 13 ranks and the suits, never at individual cards, so
+    it costs the same however many decks the cards came from and handles
+    duplicates (five of a kind, the same card twice) by their counts.
+    """
+    cards = sum(suit_counts)
+    if not cards:
+        return HandType.HIGH_CARD, 0, 0
+    present = [value for value in range(2, 15) if rank_counts[value]]
+    most = max(rank_counts)
+    # Highest rank among those with the most copies
+    most_value = max(value for value in present if rank_counts[value] == most)
+    pairs = [value for value in present if rank_counts[value] == 2]
+    is_flush = cards >= 5 and max(suit_counts) == cards
+    is_straight = len(present) >= 5 and present[-1] - present[0] == len(present) - 1
+    all_chips = sum(value * rank_counts[value] for value in present)
+
+    if most >= 5:
+        hand_type = HandType.FLUSH_FIVE if is_flush and len(present) == 1 else HandType.FIVE_OF_A_KIND
+        return hand_type, most_value * most, most
+    elif is_straight and is_flush and present[-1] == 14:
+        return HandType.ROYAL_FLUSH, all_chips, cards
+    elif is_straight and is_flush:
+        return HandType.STRAIGHT_FLUSH, all_chips, cards
+    elif most == 4:
+        return HandType.FOUR_OF_A_KIND, most_value * 4, 4
+    elif most == 3 and pairs:
+        return HandType.FULL_HOUSE, all_chips, cards
+    elif is_flush:
+        return HandType.FLUSH, all_chips, cards
+    elif is_straight:
+        return HandType.STRAIGHT, all_chips, cards
+    elif most == 3:
+        return HandType.THREE_OF_A_KIND, most_value * 3, 3
+    elif len(pairs) == 2:
+        return HandType.TWO_PAIR, 2 * sum(pairs), 4
+    elif pairs:
+        return HandType.PAIR, 2 * pairs[-1], 2
+    return HandType.HIGH_CARD, present[-1], 1
+
+def evaluate_hand(selected_cards):
+    if not selected_cards:
+        return HandType.HIGH_CARD
+    return evaluate_counts(*count_cards(selected_cards))[0]
+
+def apply_jokers(jokers, hand_type, card_chips, scoring_count):
+    """Apply joker effects to a hand and return (chips, mult)"""
+    chips = hand_type.chips + card_chips
+    mult = hand_type.mult
+
+    # Lucky Jokers add +1 to every scoring card's value (once, however many are owned)
+    if any(joker.type == JokerType.LUCKY for joker in jokers):
+        chips += scoring_count
+
+    # Apply chip-adding joker effects
+    for joker in jokers:
+        if joker.type == JokerType.LUCKY:
+            chips += 10
+        elif joker.type == JokerType.FOOL:
+            chips += 5
+        elif joker.type == JokerType.STONE:
+            chips += 3
+
+    # First apply additive multipliers
+    for joker in jokers:
+        if joker.type == JokerType.STEEL:
+            mult += 2.0
+
+    # Then apply multiplicative multipliers
+    for joker in jokers:
+        if joker.type == JokerType.GLASS and not joker.used:
+            mult *= 4.0
+        elif joker.type == JokerType.BRONZE and hand_type == HandType.PAIR:
+            mult *= 1.5
+        elif joker.type == JokerType.SILVER and hand_type == HandType.THREE_OF_A_KIND:
+            mult *= 2.0
+        elif joker.type == JokerType.GOLD and hand_type == HandType.STRAIGHT:
+            mult *= 3.0
+        elif joker.type == JokerType.DIAMOND and hand_type == HandType.FLUSH:
+            mult *= 2.5
+        elif joker.type == JokerType.COSMIC:
+            mult *= 2.0
+        elif joker.type == JokerType.STONE:
+            mult *= 1.5
+
+    return chips, mult
+
+def score_hand(selected_cards, jokers):
+    """Score cards under a joker loadout without side effects, returns (hand_type, chips, mult)"""
+    hand_type, card_chips, scoring_count = evaluate_counts(*count_cards(selected_cards))
+    chips, mult = apply_jokers(jokers, hand_type, card_chips, scoring_count)
+    return hand_type, chips, mult
+
+# Rough mix of the hands a round gets played with (from greedy simulations):
+# (hand type, share, chips from the scoring cards, number of scoring cards)
+REFERENCE_HANDS = [
+    (HandType.HIGH_CARD, 0.05, 13, 1),
+    (HandType.PAIR, 0.43, 16, 2),
+    (HandType.TWO_PAIR, 0.21, 36, 4),
+    (HandType.THREE_OF_A_KIND, 0.09, 24, 3),
+    (HandType.STRAIGHT, 0.11, 40, 5),
+    (HandType.FLUSH, 0.075, 45, 5),
+    (HandType.FULL_HOUSE, 0.03, 40, 5),
+    (HandType.FOUR_OF_A_KIND, 0.005, 32, 4),
+]
+HANDS_PER_ROUND = 3  # Typical hands played before a round is won
+TOTAL_ROUNDS = 8 * 3
+
+def estimate_hand_score(joker_names):
+    """Expected score of one hand with these jokers, used to value loadouts"""
+    jokers = [Joker(JokerType[name]) for name in joker_names]
+    fresh = sum(share * int(math.prod(apply_jokers(jokers, hand_type, chips, count)))
+                for hand_type, share, chips, count in REFERENCE_HANDS)
+    # Glass jokers only fire on the first hand of a round
+    for joker in jokers:
+        joker.used = True
+    spent = sum(share * int(math.prod(apply_jokers(jokers, hand_type, chips, count)))
+                for hand_type, share, chips, count in REFERENCE_HANDS)
+    return (fresh + spent * (HANDS_PER_ROUND - 1)) / HANDS_PER_ROUND
+
+def calculate_interest(money):
+    return money // 5  # $1 for every $5
+
+# One optimizer per joker slot count, they memoize loadout values between shops
+shop_optimizers = {}
+
+def coalesce_events(events):
+    """The input for one logic tick: ignored events are dropped and back-to-back wheel steps merged, every press is kept"""
+    kept = []
+    for event in events:
+        if event.type == pygame.MOUSEWHEEL and kept and kept[-1].type == pygame.MOUSEWHEEL:
+            # Scrolling adds up, so one scroll per tick does the same
+            kept[-1] = pygame.event.Event(pygame.MOUSEWHEEL, x=kept[-1].x + event.x, y=kept[-1].y + event.y)
+            continue
+        if event.type not in (pygame.QUIT, pygame.MOUSEBUTTONDOWN, pygame.KEYDOWN, pygame.MOUSEWHEEL,
+                              pygame.VIDEORESIZE, WORKER_RESULT):
+            continue
+        kept.append(event)
+    return kept
+
+LOGICAL_SIZE = (1280, 768)  # Every layout coordinate is in this space, whatever the window size
+
+def parse_size(text):
+    """"1920x1080" -> (1920, 1080), for --size options"""
+    width, _, height = text.lower().partition("x")
+    size = int(width), int(height)
+    if min(size) <= 0:
+        raise ValueError(f"Bad size {text!r}")
+    return size
+
+class View:
+    """Maps the logical 1280x768 layout onto a surface of any size.
+
+    The layout is scaled uniformly to fit and centered, with bars on the
+    sides that don't match the aspect ratio. Drawing goes through here with
+    logical coordinates; sources blitted must already be rendered at `scale`
+    (fonts, card faces and panels are, see LazyFont, draw_card, draw_panel),
+    so nothing is resampled per frame. Clicks come back through to_logical.
+    """
+
+    def __init__(self, surface):
+        self.set_surface(surface)
+
+    def set_surface(self, surface):
+        self.surface = surface
+        width, height = surface.get_size()
+        self.scale = min(width / LOGICAL_SIZE[0], height / LOGICAL_SIZE[1])
+        self.offset_x = (width - round(LOGICAL_SIZE[0] * self.scale)) // 2
+        self.offset_y = (height - round(LOGICAL_SIZE[1] * self.scale)) // 2
+
+    def length(self, value):
+        return round(value * self.scale)
+
+    def point(self, x, y):
+        return self.offset_x + round(x * self.scale), self.offset_y + round(y * self.scale)
+
+    def rect(self, x, y, width, height):
+        # Edges are rounded, not sizes, so neighbouring rects stay flush
+        left, top = self.point(x, y)
+        right, bottom = self.point(x + width, y + height)
+        return pygame.Rect(left, top, right - left, bottom - top)
+
+    def to_logical(self, pos):
+        return (pos[0] - self.offset_x) / self.scale, (pos[1] - self.offset_y) / self.scale
+
+    def fill(self, color):
+        self.surface.fill(color)
+
+    def blit(self, source, pos=None, center=None):
+        if center is not None:
+            self.surface.blit(source, source.get_rect(center=self.point(*center)))
+        else:
+            self.surface.blit(source, self.point(*pos))
+
+    def draw_rect(self, color, rect, width=0, border_radius=0):
+        if width:
+            width = max(1, self.length(width))
+        pygame.draw.rect(self.surface, color, self.rect(*rect), width=width,
+                         border_radius=self.length(border_radius))
+
+    def set_clip(self, rect):
+        self.surface.set_clip(None if rect is None else self.rect(*rect))
+
+class CachedFont:
+    """A font that keeps what it renders, most labels are the same from frame to frame"""
+
+    def __init__(self, font, max_entries=512):
+        self.font = font
+        self.max_entries = max_entries
+        self.rendered = OrderedDict()
+
+    def render(self, text, antialias, color):
+        key = (text, antialias, tuple(color))
+        surface = self.rendered.get(key)
+        if surface is None:
+            surface = self.rendered[key] = self.font.render(text, antialias, color)
+            if len(self.rendered) > self.max_entries:
+                self.rendered.popitem(last=False)
+        else:
+            self.rendered.move_to_end(key)
+        return surface
+
+    def __getattr__(self, name):
+        return getattr(self.font, name)
+
+class LazyFont:
+    """Font attribute that loads on first use and is shared by every Game in the process.
+
+    The size is scaled to the game's view, so text is rendered at the
+    window's resolution rather than scaled up afterwards.
+    """
+    loaded = {}
+
+    def __init__(self, size):
+        self.size = size
+
+    def __get__(self, game, owner):
+        if game is None:
+            return self
+        size = max(1, game.view.length(self.size)) if game.view else self.size
+        font = LazyFont.loaded.get(size)
+        if font is None:
+            try:
+                font = pygame.font.Font(None, size)
+            except (pygame.error, OSError):
+                # Only scan the system fonts if the bundled default font is unusable
+                font = pygame.font.SysFont("arial", size)
+            font = LazyFont.loaded[size] = CachedFont(font)
+        return font
+
 class Game:
-    def __init__(self):
-        pygame.init()
-        self.screen = pygame.display.set_mode((1280, 768))
+    # Fonts load the first time something is drawn with them, not at startup
+    title_font = LazyFont(48)
+    large_font = LazyFont(40)
+    medium_font = LazyFont(32)
+    small_font = LazyFont(24)
+    card_rank_font = LazyFont(36)
+    card_suit_font = LazyFont(48)
+    card_center_font = LazyFont(72)
+
+    def __init__(self, seed=None, headless=False, deck_spec=None, window_size=LOGICAL_SIZE, hand_size=8):
+        # Headless games (simulations, servers) skip the window and fonts entirely
+        self.headless = headless
+        self.deck_spec = deck_spec or DeckSpec()  # Kept by reset()
+        self.starting_hand_size = hand_size  # Kept by reset()
+        self.verbose = not headless
+        self.running = True
+        self.telemetry = None  # Optional TelemetrySink, see set_telemetry
+        self.telemetry_run = 0
+        self.recording = None  # List of [action, index] while recording, see replay.py
+        # Windowed games start over at game over, everything else stops there
+        self.single_run = headless
+        # Game loop, see run()
+        self.tick_rate = 60  # Logic ticks per second
+        self.max_fps = 144  # Frames drawn per second at most
+        self.max_catch_up = 5  # Ticks run back to back after a stall before time is dropped
+        self.worker = None  # BackgroundWorker while run() is going
+        self.animate = False
+        self.frame_alpha = 1.0  # How far between the last two ticks the frame being drawn is
+        
+        # Card display settings
+        self.card_width = 120
+        self.card_height = 168
+        self.card_spacing = 125
+        self.min_card_step = 40  # Closest cards overlap before the hand scrolls instead
+        self.hand_scroll = 0  # Pixels the hand is scrolled right, see hand_layout
+        self.card_faces = {}  # Pre-drawn cards, see draw_card
+        self.panels = {}  # Pre-drawn panel backgrounds, see draw_panel
+        self.window_size = window_size
+        self.view = None
+        
+        if not headless:
+            self.init_display()
+        self.reset(seed)
+
+    def init_display(self):
+        # Only the modules we use, full pygame.init() also brings up audio and joysticks
+        pygame.display.init()
+        pygame.font.init()
+        self.set_screen(pygame.display.set_mode(self.window_size, pygame.RESIZABLE))
         pygame.display.set_caption("Balatro-like")
         self.clock = pygame.time.Clock()
-        self.running = True
+        # Show the window straight away instead of a blank one while the first frame is built
+        self.screen.fill((15, 25, 35))
+        pygame.display.flip()
+        
+        self.card_back = pygame.Surface((self.card_width, self.card_height))
+        self.card_back.fill((255, 255, 255))
+
+    def set_screen(self, surface):
+        """Draw onto `surface` from now on, at whatever scale fits its size"""
+        self.screen = surface
+        if self.view is None:
+            self.view = View(surface)
+            return
+        scale = self.view.scale
+        self.view.set_surface(surface)
+        if self.view.scale != scale:
+            # Art for the old size won't be asked for again
+            self.card_faces.clear()
+            self.panels.clear()
+
+    def reset(self, seed=None):
+        """Start a new game, the window, fonts and other assets are kept"""
+        # Every shuffle and shop roll goes through this so seeded games are reproducible
+        self.seed = seed
+        self.rng = random.Random(seed)
         
         # Initialize sorting preference before dealing cards
         self.sort_by_rank = True  # Default sorting by rank
@@ -127,7 +522,7 @@ class Game:
         self.money = 3  # Starting money (changed from chips)
         self.base_mult = 1.0
         self.current_score = 0
-        self.hand_size = 8
+        self.hand_size = self.starting_hand_size
         self.preview_score = 0
         self.preview_chips = 0
         self.preview_mult = 0
@@ -145,41 +540,24 @@ class Game:
         self.ante = 1
         self.ante_round = 1
         self.base_target = 200  # Doubled the base target score
+        self.ante_growth = 1.5  # Target multiplier per ante (changed from 2.0 back to 1.5)
+        self.round_growth = 1.2  # Target multiplier per round within an ante (changed from 1.5 back to 1.2)
         self.target_score = self.calculate_target_score()
         self.round_complete = False
-        
-        # Card display settings
-        self.card_width = 120
-        self.card_height = 168
-        self.card_spacing = 125
-        self.card_back = pygame.Surface((self.card_width, self.card_height))
-        self.card_back.fill((255, 255, 255))
-        
-        # Initialize fonts
-        try:
-            self.title_font = pygame.font.Font(None, 48)
-            self.large_font = pygame.font.Font(None, 40)
-            self.medium_font = pygame.font.Font(None, 32)
-            self.small_font = pygame.font.Font(None, 24)
-            self.card_rank_font = pygame.font.Font(None, 36)
-            self.card_suit_font = pygame.font.Font(None, 48)
-            self.card_center_font = pygame.font.Font(None, 72)
-        except:
-            self.title_font = pygame.font.SysFont("arial", 48)
-            self.large_font = pygame.font.SysFont("arial", 40)
-            self.medium_font = pygame.font.SysFont("arial", 32)
-            self.small_font = pygame.font.SysFont("arial", 24)
-            self.card_rank_font = pygame.font.SysFont("arial", 36)
-            self.card_suit_font = pygame.font.SysFont("arial", 48)
-            self.card_center_font = pygame.font.SysFont("arial", 72)
+        self.shop_advice = None  # Set when entering the shop, see update_shop_advice
+        self.score_shown = 0  # Counts up to current_score, one step per tick
+        self.score_shown_before = 0
+        if self.worker:
+            # Nothing still being worked out applies to the new game
+            self.worker.cancel()
 
     def create_deck(self):
-        ranks = ['2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A']
         deck = []
-        for suit in Suit:
-            for rank in ranks:
-                deck.append(Card(suit, rank))
-        random.shuffle(deck)
+        for _ in range(self.deck_spec.decks):
+            for suit in self.deck_spec.suits:
+                for rank in self.deck_spec.ranks:
+                    deck.append(Card(suit, rank))
+        self.rng.shuffle(deck)
         return deck
 
     def deal_initial_hand(self):
@@ -189,48 +567,12 @@ class Game:
         self.sort_cards()  # Sort the initial hand
 
     def evaluate_selected_hand(self, selected_cards):
-        if not selected_cards:
-            return HandType.HIGH_CARD
-        
-        # Count ranks and suits of selected cards only
-        ranks = [card.value for card in selected_cards if not card.is_joker]
-        suits = [card.suit for card in selected_cards if not card.is_joker]
-        rank_counts = Counter(ranks)
-        suit_counts = Counter(suits)
-        
-        # Check for different hand types
-        is_flush = len(suit_counts) == 1 and len(suits) >= 5
-        is_straight = False
-        if ranks:
-            sorted_ranks = sorted(set(ranks))
-            is_straight = len(sorted_ranks) >= 5 and max(sorted_ranks) - min(sorted_ranks) == len(sorted_ranks) - 1
-        
-        # Determine hand type
-        if is_straight and is_flush and max(ranks) == 14:
-            return HandType.ROYAL_FLUSH
-        elif is_straight and is_flush:
-            return HandType.STRAIGHT_FLUSH
-        elif 4 in rank_counts.values():
-            return HandType.FOUR_OF_A_KIND
-        elif set(rank_counts.values()) == {2, 3}:
-            return HandType.FULL_HOUSE
-        elif is_flush:
-            return HandType.FLUSH
-        elif is_straight:
-            return HandType.STRAIGHT
-        elif 3 in rank_counts.values():
-            return HandType.THREE_OF_A_KIND
-        elif list(rank_counts.values()).count(2) == 2:
-            return HandType.TWO_PAIR
-        elif 2 in rank_counts.values():
-            return HandType.PAIR
-        else:
-            return HandType.HIGH_CARD
+        return evaluate_hand(selected_cards)
 
     def calculate_target_score(self):
-        # Scale target score based on ante and round (reverting to original values)
-        base_multiplier = 1.5 ** (self.ante - 1)  # Changed from 2.0 back to 1.5
-        round_multiplier = 1.2 ** (self.ante_round - 1)  # Changed from 1.5 back to 1.2
+        # Scale target score based on ante and round
+        base_multiplier = self.ante_growth ** (self.ante - 1)
+        round_multiplier = self.round_growth ** (self.ante_round - 1)
         return int(self.base_target * base_multiplier * round_multiplier)
 
     def calculate_score(self):
@@ -238,93 +580,75 @@ class Game:
         if not selected_cards:
             return 0
         
-        hand_type = self.evaluate_selected_hand(selected_cards)
-        
-        # Start with base values from hand type
-        base_chips = hand_type.chips
-        base_mult = hand_type.mult
-        
-        # Calculate chips first
-        final_chips = base_chips
-        
-        # Add chips from card values based on hand type
-        non_joker_cards = [c for c in selected_cards if not c.is_joker]
-        
-        # Apply Lucky Joker effect first
-        if any(joker.type == JokerType.LUCKY for joker in self.jokers):
-            for card in non_joker_cards:
-                card.value += 1
-        
-        # Calculate chips based on hand type
-        if hand_type == HandType.HIGH_CARD:
-            highest_card = max(non_joker_cards, key=lambda x: x.value)
-            final_chips += highest_card.get_chip_value()
-        elif hand_type == HandType.PAIR:
-            paired_value = next(value for value, count in Counter([c.value for c in non_joker_cards]).items() if count == 2)
-            paired_cards = [c for c in non_joker_cards if c.value == paired_value]
-            final_chips += sum(c.get_chip_value() for c in paired_cards)
-        elif hand_type == HandType.TWO_PAIR:
-            pairs = [value for value, count in Counter([c.value for c in non_joker_cards]).items() if count == 2]
-            paired_cards = [c for c in non_joker_cards if c.value in pairs]
-            final_chips += sum(c.get_chip_value() for c in paired_cards)
-        elif hand_type == HandType.THREE_OF_A_KIND:
-            three_value = next(value for value, count in Counter([c.value for c in non_joker_cards]).items() if count >= 3)
-            matching_cards = [c for c in non_joker_cards if c.value == three_value][:3]
-            final_chips += sum(c.get_chip_value() for c in matching_cards)
-        elif hand_type in [HandType.STRAIGHT, HandType.FLUSH, HandType.STRAIGHT_FLUSH, HandType.ROYAL_FLUSH]:
-            final_chips += sum(c.get_chip_value() for c in non_joker_cards)
-        elif hand_type == HandType.FULL_HOUSE:
-            final_chips += sum(c.get_chip_value() for c in non_joker_cards)
-        elif hand_type == HandType.FOUR_OF_A_KIND:
-            four_value = next(value for value, count in Counter([c.value for c in non_joker_cards]).items() if count == 4)
-            four_cards = [c for c in non_joker_cards if c.value == four_value]
-            final_chips += sum(c.get_chip_value() for c in four_cards)
-        
-        # Apply chip-adding joker effects
-        for joker in self.jokers:
-            if joker.type == JokerType.LUCKY:
-                final_chips += 10
-            elif joker.type == JokerType.FOOL:
-                final_chips += 5
-            elif joker.type == JokerType.STONE:
-                final_chips += 3
-        
-        # Calculate final multiplier
-        final_mult = base_mult
+        hand_type, final_chips, final_mult = score_hand(selected_cards, self.jokers)
         
-        # First apply additive multipliers
+        # Glass jokers only fire once per round
         for joker in self.jokers:
-            if joker.type == JokerType.STEEL:
-                final_mult += 2.0
-        
-        # Then apply multiplicative multipliers
-        for joker in self.jokers:
-            if joker.type == JokerType.GLASS and not joker.used:
-                final_mult *= 4.0
+            if joker.type == JokerType.GLASS:
                 joker.used = True
-            elif joker.type == JokerType.BRONZE and hand_type == HandType.PAIR:
-                final_mult *= 1.5
-            elif joker.type == JokerType.SILVER and hand_type == HandType.THREE_OF_A_KIND:
-                final_mult *= 2.0
-            elif joker.type == JokerType.GOLD and hand_type == HandType.STRAIGHT:
-                final_mult *= 3.0
-            elif joker.type == JokerType.DIAMOND and hand_type == HandType.FLUSH:
-                final_mult *= 2.5
-            elif joker.type == JokerType.COSMIC:
-                final_mult *= 2.0
-            elif joker.type == JokerType.STONE:
-                final_mult *= 1.5
-        
-        # Reset card values after Lucky Joker effect
-        if any(joker.type == JokerType.LUCKY for joker in self.jokers):
-            for card in non_joker_cards:
-                card.value -= 1
         
         return int(final_chips * final_mult)
 
     def generate_shop_jokers(self):
         available_jokers = list(JokerType)
-        return [Joker(random.choice(available_jokers)) for _ in range(3)]
+        return [Joker(self.rng.choice(available_jokers)) for _ in range(3)]
+
+    def play_hand(self):
+        """Play the selected cards, returns False if nothing was selected"""
+        if not any(card.selected for card in self.hand):
+            return False  # Don't process if no cards selected
+            
+        selected_cards = [card for card in self.hand if card.selected]
+        if self.telemetry:
+            # Score before calculate_score uses up the glass jokers
+            hand_type, chips, mult = score_hand(selected_cards, self.jokers)
+            money_before = self.money
+        
+        # Add to current_score instead of replacing it
+        score = self.calculate_score()
+        self.current_score += score
+        self.hands_remaining -= 1
+        
+        # Only discard selected cards
+        self.hand = [card for card in self.hand if not card.selected]
+        self.discard_pile.extend(selected_cards)
+        
+        # Draw new cards to replace discarded ones
+        cards_needed = self.hand_size - len(self.hand)
+        for _ in range(cards_needed):
+            if self.deck:
+                self.hand.append(self.deck.pop())
+        
+        # Reset all card selections
+        for card in self.hand:
+            card.selected = False
+        
+        # Sort the new hand
+        self.sort_cards()
+        
+        # Check win/loss conditions
+        if self.current_score >= self.target_score:
+            self.round_complete = True
+            self.win_round()
+        elif self.hands_remaining == 0 and not self.round_complete:
+            if self.verbose:
+                print(f"Final score: {self.current_score}, Target: {self.target_score}")
+            if self.telemetry:
+                # Record before game_over resets the state
+                self.telemetry.record_hand(self, self.telemetry_run, selected_cards, hand_type,
+                                           chips, mult, score, money_before)
+            self.game_over()
+            return True
+        if self.telemetry:
+            self.telemetry.record_hand(self, self.telemetry_run, selected_cards, hand_type,
+                                       chips, mult, score, money_before)
+        return True
+
+    def set_telemetry(self, sink):
+        """Record every played hand into a TelemetrySink (None turns it off)"""
+        self.telemetry = sink
+        if sink:
+            self.telemetry_run = sink.start_run()
 
     def discard_selected_cards(self):
         if not self.hands_remaining > 0:
@@ -343,7 +667,7 @@ class Game:
             elif self.discard_pile:
                 self.deck = self.discard_pile
                 self.discard_pile = []
-                random.shuffle(self.deck)
+                self.rng.shuffle(self.deck)
                 if self.deck:
                     self.hand.append(self.deck.pop())
         
@@ -366,115 +690,207 @@ class Game:
             self.jokers.pop(index)
 
     def run(self):
-        while self.running:
-            self.handle_events()
-            self.update()
-            self.draw()
-            self.clock.tick(60)
+        # Game logic runs at a fixed tick_rate, frames are drawn as often as max_fps
+        # allows in between, interpolated between the last two ticks. Shop
+        # advice is worked out on a background thread so drawing never waits.
+        self.worker = BackgroundWorker()
+        self.animate = True
+        tick = 1.0 / self.tick_rate
+        previous = time.perf_counter()
+        lag = 0.0
+        try:
+            while self.running:
+                now = time.perf_counter()
+                lag = min(lag + now - previous, tick * self.max_catch_up)
+                previous = now
+                while lag >= tick and self.running:
+                    self.handle_events(coalesce_events(pygame.event.get()))
+                    self.update()
+                    lag -= tick
+                self.frame_alpha = lag / tick
+                self.draw()
+                self.clock.tick(self.max_fps)
+        finally:
+            self.worker.close()
+            self.worker = None
+            self.animate = False
         pygame.quit()
 
-    def handle_events(self):
-        for event in pygame.event.get():
+    def handle_events(self, events=None):
+        # events defaults to the pygame queue, input_bench.py passes in what it records
+        for event in pygame.event.get() if events is None else events:
             if event.type == pygame.QUIT:
                 self.running = False
             elif event.type == pygame.MOUSEBUTTONDOWN:
-                mouse_pos = pygame.mouse.get_pos()
+                # Where the click happened, not where the mouse is by the time we get to it,
+                # in the same logical coordinates everything is laid out in
+                mouse_pos = self.view.to_logical(event.pos) if self.view else event.pos
                 if self.phase == "play":
                     if event.button == 3:  # Right click
                         self.handle_joker_sell(mouse_pos)
                     else:
                         # Check sort buttons first
-                        button_width = 100
-                        # Position buttons at top-right with 20px right margin
-                        button_x = 1280 - 20 - (button_width * 2 + 5)
-                        button_y = 5
-                        button_height = 28
-                        
-                        if (button_x <= mouse_pos[0] <= button_x + button_width and
-                            button_y <= mouse_pos[1] <= button_y + button_height):
-                            self.sort_by_rank = True
-                            self.sort_cards()
-                        elif (button_x + button_width + 5 <= mouse_pos[0] <= button_x + button_width * 2 + 5 and
-                              button_y <= mouse_pos[1] <= button_y + button_height):
-                            self.sort_by_rank = False
-                            self.sort_cards()
+                        rank_rect, suit_rect = self.sort_button_rects()
+                        if rank_rect.collidepoint(mouse_pos):
+                            self.apply_action("sort_rank")
+                        elif suit_rect.collidepoint(mouse_pos):
+                            self.apply_action("sort_suit")
                         else:
                             self.handle_card_click(mouse_pos)
-                            self.update_preview_score()
                 elif self.phase == "shop":
-                    self.handle_shop_click(mouse_pos)
+                    if event.button == 3:  # Right click
+                        self.handle_shop_sell(mouse_pos)
+                    else:
+                        self.handle_shop_click(mouse_pos)
             elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_SPACE and self.hands_remaining > 0:
-                    if not any(card.selected for card in self.hand):
-                        continue  # Don't process if no cards selected
-                        
-                    # Add to current_score instead of replacing it
-                    self.current_score += self.calculate_score()
-                    self.hands_remaining -= 1
-                    
-                    # Only discard selected cards
-                    selected_cards = [card for card in self.hand if card.selected]
-                    self.hand = [card for card in self.hand if not card.selected]
-                    self.discard_pile.extend(selected_cards)
-                    
-                    # Draw new cards to replace discarded ones
-                    cards_needed = self.hand_size - len(self.hand)
-                    for _ in range(cards_needed):
-                        if self.deck:
-                            self.hand.append(self.deck.pop())
-                    
-                    # Reset all card selections
-                    for card in self.hand:
-                        card.selected = False
-                    
-                    # Sort the new hand
-                    self.sort_cards()
-                    
-                    # Check win/loss conditions
-                    if self.current_score >= self.target_score:
-                        self.round_complete = True
-                        self.win_round()
-                    elif self.hands_remaining == 0 and not self.round_complete:
-                        print(f"Final score: {self.current_score}, Target: {self.target_score}")
-                        self.game_over()
-                elif event.key == pygame.K_d and self.discards_remaining > 0:
-                    if self.discard_selected_cards():
-                        self.sort_cards()
-                        self.update_preview_score()
-                elif event.key == pygame.K_n and self.phase == "shop":
-                    self.next_round()
-                elif event.key == pygame.K_s and self.phase == "play":
-                    # Allow skipping only on rounds 1 and 2
-                    if self.ante_round < 3:
-                        self.skip_round()
+                if event.key == pygame.K_SPACE:
+                    self.apply_action("play")
+                elif event.key == pygame.K_d:
+                    self.apply_action("discard")
+                elif event.key == pygame.K_n:
+                    self.apply_action("next")
+                elif event.key == pygame.K_s:
+                    self.apply_action("skip")
+                elif event.key == pygame.K_LEFT:
+                    self.scroll_hand(-self.card_spacing)
+                elif event.key == pygame.K_RIGHT:
+                    self.scroll_hand(self.card_spacing)
+            elif event.type == pygame.MOUSEWHEEL:
+                if self.phase == "play":
+                    self.scroll_hand((event.x - event.y) * self.min_card_step)
+            elif event.type == pygame.VIDEORESIZE:
+                self.set_screen(pygame.display.get_surface())
+            elif event.type == WORKER_RESULT:
+                self.apply_worker_result(event)
+
+    def apply_worker_result(self, event):
+        if event.error is not None:
+            # A failed hint is not worth the game, it just doesn't show
+            print(f"Background {event.kind} failed: {event.error!r}", file=sys.stderr)
+            return
+        # A result for a selection or shop that has changed since is dropped
+        if self.worker is None or not self.worker.is_current(event.kind, event.generation):
+            return
+        if event.kind == "advice":
+            self.shop_advice = event.result
+
+    def apply_action(self, action, index=None):
+        """Apply a player action by name, returns False if it isn't allowed right now.
+
+        This holds the rules for what the keys and clicks do, so headless
+        front-ends (server, replays) behave exactly like the window.
+        """
+        if self.recording is not None:
+            self.recording.append([action, index])
+        if action == "select":
+            if self.phase != "play" or not 0 <= index < len(self.hand):
+                return False
+            card = self.hand[index]
+            # Only allow selection if under max or card is already selected
+            if not card.selected and sum(1 for c in self.hand if c.selected) >= self.max_selected:
+                return False
+            card.selected = not card.selected
+            self.update_preview_score()
+            return True
+        elif action == "play":
+            return self.hands_remaining > 0 and self.play_hand()
+        elif action == "discard":
+            if self.discards_remaining > 0 and self.discard_selected_cards():
+                self.sort_cards()
+                self.update_preview_score()
+                return True
+            return False
+        elif action == "buy":
+            if self.phase != "shop" or not 0 <= index < len(self.shop_jokers):
+                return False
+            owned = len(self.jokers)
+            self.buy_joker(index)
+            if len(self.jokers) == owned:
+                return False
+            self.update_shop_advice()
+            return True
+        elif action == "sell":
+            if not 0 <= index < len(self.jokers):
+                return False
+            self.sell_joker(index)
+            if self.phase == "shop":
+                self.update_shop_advice()
+            return True
+        elif action == "next":
+            if self.phase != "shop":
+                return False
+            self.next_round()
+            return True
+        elif action == "skip":
+            # Allow skipping only on rounds 1 and 2
+            if self.phase != "play" or self.ante_round >= 3:
+                return False
+            self.skip_round()
+            return True
+        elif action in ("sort_rank", "sort_suit"):
+            self.sort_by_rank = action == "sort_rank"
+            self.sort_cards()
+            return True
+        raise ValueError(f"Unknown action: {action}")
 
     def handle_card_click(self, pos):
         x, y = pos
-        # Calculate card starting position (same as in draw_play_phase)
-        screen_width = 1280
-        max_card_end_x = screen_width - 20
-        left_margin = 250
-        
-        total_card_width = len(self.hand) * self.card_spacing - (self.card_spacing - self.card_width)
-        available_width = max_card_end_x - left_margin
-        
-        if total_card_width <= available_width:
-            start_x = left_margin + (available_width - total_card_width) // 2
-        else:
-            start_x = left_margin
-        
-        card_y = 340
-        
-        card_x = start_x
-        for card in self.hand:
-            if (card_x <= x <= card_x + self.card_width and 
-                card_y <= y <= card_y + self.card_height):
-                # Only allow selection if under max or card is already selected
-                if not card.selected and sum(1 for c in self.hand if c.selected) >= self.max_selected:
-                    continue
-                card.selected = not card.selected
+        layout = self.hand_layout()
+        _, _, card_y, left, right = layout
+        if not (left <= x <= right and card_y <= y <= card_y + self.card_height):
+            return
+        # Later cards are drawn over earlier ones, so the topmost card is the last one hit
+        for i in reversed(self.visible_cards(layout)):
+            card_x = self.card_x(layout, i)
+            if card_x <= x <= card_x + self.card_width:
+                self.apply_action("select", i)
                 break
-            card_x += self.card_spacing
+
+    def hand_layout(self):
+        """Where the hand is drawn: (x of the first card, step between cards, y, viewport left, viewport right).
+
+        Cards keep card_spacing while they fit, then overlap down to
+        min_card_step, past that the hand scrolls by hand_scroll pixels.
+        """
+        left = 250  # Align just right of the left info panel
+        right = LOGICAL_SIZE[0] - 20  # 20px right margin
+        available = right - left
+        count = len(self.hand)
+        total = count * self.card_spacing - (self.card_spacing - self.card_width)
+        if total <= available:
+            # Cards fit, center them
+            return left + (available - total) // 2, self.card_spacing, 340, left, right
+        step = max(self.min_card_step, (available - self.card_width) / (count - 1))
+        scroll = max(0, min(self.hand_scroll, self.card_width + (count - 1) * step - available))
+        return left - scroll, step, 340, left, right
+
+    def joker_bar_rects(self):
+        """Where the owned jokers sit in the play phase's top bar, for drawing and right clicks"""
+        bar_x = self.hand_layout()[3]  # Lines up with the hand
+        return [pygame.Rect(bar_x + 15 + i * 150, 30 + 45, 140, 85) for i in range(min(len(self.jokers), 6))]
+
+    def sort_button_rects(self):
+        """(rank, suit) sort buttons at the top right, 20px from the edge"""
+        button_width = 100
+        button_x = LOGICAL_SIZE[0] - 20 - (button_width * 2 + 5)
+        return (pygame.Rect(button_x, 5, button_width, 28),
+                pygame.Rect(button_x + button_width + 5, 5, button_width, 28))
+
+    def card_x(self, layout, i):
+        return int(layout[0] + i * layout[1])
+
+    def visible_cards(self, layout):
+        """Indices of the cards that show in the viewport, only these are drawn and hit-tested"""
+        start_x, step, _, left, right = layout
+        first = max(0, math.floor((left - start_x - self.card_width) / step))
+        last = min(len(self.hand) - 1, math.floor((right - start_x) / step))
+        return range(first, last + 1)
+
+    def scroll_hand(self, pixels):
+        layout = self.hand_layout()
+        start_x, step, _, left, right = layout
+        overflow = self.card_width + (len(self.hand) - 1) * step - (right - left)
+        self.hand_scroll = max(0, min(self.hand_scroll + pixels, int(overflow)))
 
     def handle_shop_click(self, pos):
         x, y = pos
@@ -489,36 +905,63 @@ class Game:
             joker_click_y = shop_start_y + i * joker_spacing
             if (joker_x <= x <= joker_x + joker_width and 
                 joker_click_y <= y <= joker_click_y + joker_height):
-                self.buy_joker(i)
+                self.apply_action("buy", i)
                 break
 
     def handle_joker_sell(self, pos):
-        x, y = pos
-        # Top horizontal joker bar layout must match draw_play_phase
-        bar_x = 350
-        bar_y = 30
-        bar_width = 1280 - bar_x - 20
-        # Joker card size and spacing in the bar
-        joker_width = 140
-        joker_height = 85
-        joker_spacing = 150
-        start_x = bar_x + 15
-        start_y = bar_y + 45
-
-        for i, _ in enumerate(self.jokers):
-            if i >= 6:
+        for i, rect in enumerate(self.joker_bar_rects()):
+            if rect.collidepoint(pos):
+                self.apply_action("sell", i)
                 break
-            jx = start_x + i * joker_spacing
-            jy = start_y
-            if (jx <= x <= jx + joker_width and jy <= y <= jy + joker_height):
-                self.sell_joker(i)
+
+    def handle_shop_sell(self, pos):
+        x, y = pos
+        # Owned joker column layout must match draw_shop_phase
+        for i in range(len(self.jokers)):
+            jx, jy = 30, 150 + i * 95
+            if (jx <= x <= jx + 260 and jy <= y <= jy + 85):
+                self.apply_action("sell", i)
                 break
 
+    def get_shop_advice(self, allow_sell=True):
+        """Ask the shop optimizer which owned jokers to sell and which shop jokers to buy"""
+        optimizer, args = self.shop_advice_request(allow_sell)
+        return optimizer.recommend(*args)
+
+    def shop_advice_request(self, allow_sell=True):
+        """The optimizer and a snapshot of the arguments for it, safe to hand to the worker"""
+        optimizer = shop_optimizers.get(self.max_jokers)
+        if optimizer is None:
+            catalog = {joker_type.name: Joker(joker_type).cost for joker_type in JokerType}
+            optimizer = shop_optimizers[self.max_jokers] = ShopOptimizer(
+                estimate_hand_score, catalog, calculate_interest, self.max_jokers)
+        hands_left = max(0, TOTAL_ROUNDS - self.round) * HANDS_PER_ROUND
+        return optimizer, (
+            self.money,
+            [(joker.type.name, joker.cost) for joker in self.jokers],
+            [(joker.type.name, joker.cost) for joker in self.shop_jokers],
+            hands_left,
+            allow_sell,
+        )
+
+    def update_shop_advice(self):
+        # Only the window shows advice, headless callers ask get_shop_advice themselves
+        if self.headless:
+            return
+        if self.worker:
+            # Old advice may point at jokers that are gone, hide it until the new one is in
+            self.shop_advice = None
+            optimizer, args = self.shop_advice_request()
+            self.worker.submit("advice", optimizer.recommend, *args)
+        else:
+            self.shop_advice = self.get_shop_advice()
+
     def win_round(self):
         # Award money for the winning hand
         money_reward = self.calculate_money_reward()
         self.money += money_reward
-        print(f"Won ${money_reward}! New total: ${self.money}")
+        if self.verbose:
+            print(f"Won ${money_reward}! New total: ${self.money}")
         
         # Reset all card selections
         for card in self.hand:
@@ -527,11 +970,17 @@ class Game:
         # Automatically go to shop
         self.phase = "shop"
         self.shop_jokers = self.generate_shop_jokers()
+        self.update_shop_advice()
 
     def game_over(self):
+        if self.single_run:
+            # Leave the final state in place for whoever is driving the game
+            self.running = False
+            return
         print("Game Over! You didn't reach the target score.")
-        # Reset game
-        self.__init__()
+        # Reset the game state only, a new game is a new telemetry run
+        self.reset()
+        self.set_telemetry(self.telemetry)
 
     def next_round(self):
         if self.phase == "play":
@@ -570,60 +1019,67 @@ class Game:
             card.selected = False
 
     def update(self):
-        # Game logic updates here
-        pass
+        # One logic tick: the score on screen counts up towards the real one
+        self.score_shown_before = self.score_shown
+        if self.score_shown < self.current_score:
+            step = max(1, (self.current_score - self.score_shown) // 6)
+            self.score_shown = min(self.current_score, self.score_shown + step)
+        else:
+            self.score_shown = self.current_score
+
+    def shown_score(self):
+        if not self.animate:
+            return self.current_score
+        return int(self.score_shown_before + (self.score_shown - self.score_shown_before) * self.frame_alpha)
 
     def draw(self):
-        self.screen.fill((20, 71, 41))  # Darker green background
+        self.draw_frame()
+        pygame.display.flip()
+
+    def draw_frame(self):
+        # Everything but the flip, the replay renderer draws onto its own surface
+        self.view.fill((20, 71, 41))  # Darker green background
 
         if self.phase == "play":
             self.draw_play_phase()
         else:
             self.draw_shop_phase()
 
-        pygame.display.flip()
-
     def draw_play_phase(self):
-        self.screen.fill((15, 25, 35))  # Dark blue-gray background
-        
-        # Calculate card positioning - cards use full width minus right margin
-        max_card_end_x = 1280 - 20  # 20px right margin
-        left_margin = 250  # Align just right of the left info panel
-        
-        # Calculate total width needed for all cards
-        total_card_width = len(self.hand) * self.card_spacing - (self.card_spacing - self.card_width)
-        
-        # Calculate available width
-        available_width = max_card_end_x - left_margin
-        
-        # If cards fit, center them. Otherwise, scale spacing or start from left margin
-        if total_card_width <= available_width:
-            start_x = left_margin + (available_width - total_card_width) // 2
-        else:
-            # Cards don't fit with current spacing, start from left margin
-            start_x = left_margin
-        
-        card_y = 340  # Lower the row of cards slightly
-        
-        # Draw cards in hand
-        x = start_x
-        for card in self.hand:
-            self.draw_card(self.screen, x, card_y, card, card.selected)
-            x += self.card_spacing
+        self.view.fill((15, 25, 35))  # Dark blue-gray background
+        
+        # Only the cards in the viewport are drawn, so big hands cost no more than small ones
+        layout = self.hand_layout()
+        start_x, step, card_y, left, right = layout
+        self.view.set_clip((left, card_y, right - left + 4, self.card_height + 4))
+        for i in self.visible_cards(layout):
+            card = self.hand[i]
+            self.draw_card(self.view, self.card_x(layout, i), card_y, card, card.selected)
+        self.view.set_clip(None)
+        hand_width = min(self.card_width + (len(self.hand) - 1) * step, right - left)
+        
+        if start_x < left or self.card_x(layout, len(self.hand) - 1) + self.card_width > right:
+            # Scrollbar under the hand
+            content_width = self.card_width + (len(self.hand) - 1) * step
+            bar_y = card_y + self.card_height + 8
+            self.view.draw_rect((40, 50, 60), (left, bar_y, right - left, 6), border_radius=3)
+            thumb_width = max(20, int((right - left) * (right - left) / content_width))
+            thumb_x = left + int((left - start_x) / (content_width - (right - left)) * (right - left - thumb_width))
+            self.view.draw_rect((120, 140, 160), (thumb_x, bar_y, thumb_width, 6), border_radius=3)
 
         # Draw game info panel (left side)
         panel_width = 320
         panel_height = 240
         panel_x = 30
         panel_y = 30
-        self.draw_panel(self.screen, panel_x, panel_y, panel_width, panel_height, (30, 40, 50))
+        self.draw_panel(self.view, panel_x, panel_y, panel_width, panel_height, (30, 40, 50))
         
         y_offset = panel_y + 20
         line_height = 28
         
         # Title
         title_text = self.large_font.render("Game Info", True, (255, 220, 100))
-        self.screen.blit(title_text, (panel_x + 15, y_offset))
+        self.view.blit(title_text, (panel_x + 15, y_offset))
         y_offset += line_height + 5
         
         # Info items
@@ -631,7 +1087,7 @@ class Game:
             ("Ante", str(self.ante)),
             ("Round", f"{self.ante_round}/3"),
             ("Target", str(self.target_score)),
-            ("Score", str(self.current_score)),
+            ("Score", str(self.shown_score())),
             ("Money", f"${self.money}"),
             ("Discards", str(self.discards_remaining)),
             ("Hands", str(self.hands_remaining))
@@ -640,55 +1096,48 @@ class Game:
         for label, value in info_items:
             label_text = self.small_font.render(f"{label}:", True, (180, 180, 200))
             value_text = self.medium_font.render(value, True, (255, 255, 255))
-            self.screen.blit(label_text, (panel_x + 20, y_offset))
-            self.screen.blit(value_text, (panel_x + 120, y_offset))
+            self.view.blit(label_text, (panel_x + 20, y_offset))
+            self.view.blit(value_text, (panel_x + 120, y_offset))
             y_offset += line_height
 
         # Draw jokers bar (top horizontal)
-        joker_bar_x = left_margin
+        joker_bar_x = left  # Lines up with the hand
         joker_bar_y = 30
-        joker_bar_width = 1280 - joker_bar_x - 20
+        joker_bar_width = LOGICAL_SIZE[0] - joker_bar_x - 20
         joker_bar_height = 110
-        self.draw_panel(self.screen, joker_bar_x, joker_bar_y, joker_bar_width, joker_bar_height, (40, 35, 25))
+        self.draw_panel(self.view, joker_bar_x, joker_bar_y, joker_bar_width, joker_bar_height, (40, 35, 25))
 
         # Joker title
         joker_title = self.medium_font.render("Jokers", True, (255, 220, 100))
-        self.screen.blit(joker_title, (joker_bar_x + 15, joker_bar_y + 12))
+        self.view.blit(joker_title, (joker_bar_x + 15, joker_bar_y + 12))
 
         # Draw jokers horizontally
-        j_start_x = joker_bar_x + 15
-        j_start_y = joker_bar_y + 45
-        j_width = 140
-        j_height = 85
-        j_spacing = 150
-        for i, joker in enumerate(self.jokers[:6]):
-            jx = j_start_x + i * j_spacing
-            jy = j_start_y
-            joker_card_rect = pygame.Rect(jx, jy, j_width, j_height)
-            pygame.draw.rect(self.screen, (250, 220, 50), joker_card_rect, border_radius=6)
-            pygame.draw.rect(self.screen, (200, 170, 0), joker_card_rect, width=2, border_radius=6)
+        for joker, joker_card_rect in zip(self.jokers, self.joker_bar_rects()):
+            jx, jy = joker_card_rect.topleft
+            self.view.draw_rect((250, 220, 50), joker_card_rect, border_radius=6)
+            self.view.draw_rect((200, 170, 0), joker_card_rect, width=2, border_radius=6)
 
             name = joker.type.value[0]
             if len(name) > 16:
                 name = name[:13] + "..."
             name_text = self.small_font.render(name, True, (40, 20, 0))
-            self.screen.blit(name_text, (jx + 8, jy + 6))
+            self.view.blit(name_text, (jx + 8, jy + 6))
 
             desc = joker.type.value[1]
             if len(desc) > 18:
                 desc = desc[:15] + "..."
             desc_text = self.small_font.render(desc, True, (80, 60, 0))
-            self.screen.blit(desc_text, (jx + 8, jy + 28))
+            self.view.blit(desc_text, (jx + 8, jy + 28))
 
             sell_text = self.small_font.render(f"Sell: ${joker.cost//2}", True, (100, 50, 0))
-            self.screen.blit(sell_text, (jx + 8, jy + 52))
+            self.view.blit(sell_text, (jx + 8, jy + 52))
         
         # Draw preview panel (below cards)
         if any(card.selected for card in self.hand):
-            preview_x = start_x
+            preview_x = max(start_x, left)
             preview_y = card_y + self.card_height + 20
-            preview_width = min(total_card_width, 500)
-            self.draw_panel(self.screen, preview_x, preview_y, preview_width, 100, (20, 30, 40))
+            preview_width = min(hand_width, 500)
+            self.draw_panel(self.view, preview_x, preview_y, preview_width, 100, (20, 30, 40))
             
             preview_y_offset = preview_y + 15
             preview_items = [
@@ -702,15 +1151,15 @@ class Game:
                 x_pos = preview_x + 20 + i * item_spacing
                 label_text = self.small_font.render(label, True, (180, 180, 200))
                 value_text = self.medium_font.render(value, True, (100, 255, 150))
-                self.screen.blit(label_text, (x_pos, preview_y_offset))
-                self.screen.blit(value_text, (x_pos, preview_y_offset + 25))
+                self.view.blit(label_text, (x_pos, preview_y_offset))
+                self.view.blit(value_text, (x_pos, preview_y_offset + 25))
 
         # Draw instructions panel (bottom left)
         inst_panel_x = 30
         inst_panel_y = 680
         inst_panel_width = 350
         inst_panel_height = 70
-        self.draw_panel(self.screen, inst_panel_x, inst_panel_y, inst_panel_width, inst_panel_height, (25, 30, 35))
+        self.draw_panel(self.view, inst_panel_x, inst_panel_y, inst_panel_width, inst_panel_height, (25, 30, 35))
         
         instructions = [
             "SPACE: Play  |  D: Discard  |  N: Next  |  S: Skip"
@@ -718,54 +1167,48 @@ class Game:
         y_pos = inst_panel_y + 12
         for inst in instructions:
             text = self.small_font.render(inst, True, (200, 200, 220))
-            self.screen.blit(text, (inst_panel_x + 15, y_pos))
+            self.view.blit(text, (inst_panel_x + 15, y_pos))
             y_pos += 20
 
         # Draw sort buttons (top right)
-        button_width = 100
-        button_x = 1280 - 20 - (button_width * 2 + 5)
-        button_y = 5
-        button_height = 28
+        rank_rect, suit_rect = self.sort_button_rects()
+        button_x, button_y = rank_rect.topleft
+        button_width = rank_rect.width
         
         # Rank sort button
         rank_bg = (80, 120, 150) if self.sort_by_rank else (50, 70, 90)
-        rank_rect = pygame.Rect(button_x, button_y, button_width, button_height)
-        pygame.draw.rect(self.screen, rank_bg, rank_rect, border_radius=4)
-        pygame.draw.rect(self.screen, (120, 160, 200) if self.sort_by_rank else (70, 90, 110), 
-                        rank_rect, width=2, border_radius=4)
+        self.view.draw_rect(rank_bg, rank_rect, border_radius=4)
+        self.view.draw_rect((120, 160, 200) if self.sort_by_rank else (70, 90, 110), 
+                            rank_rect, width=2, border_radius=4)
         rank_text = self.small_font.render("Sort: Rank", True, (255, 255, 255))
-        self.screen.blit(rank_text, (button_x + 10, button_y + 6))
+        self.view.blit(rank_text, (button_x + 10, button_y + 6))
         
         # Suit sort button
         suit_bg = (80, 120, 150) if not self.sort_by_rank else (50, 70, 90)
-        suit_rect = pygame.Rect(button_x + button_width + 5, button_y, button_width, button_height)
-        pygame.draw.rect(self.screen, suit_bg, suit_rect, border_radius=4)
-        pygame.draw.rect(self.screen, (120, 160, 200) if not self.sort_by_rank else (70, 90, 110), 
-                        suit_rect, width=2, border_radius=4)
+        self.view.draw_rect(suit_bg, suit_rect, border_radius=4)
+        self.view.draw_rect((120, 160, 200) if not self.sort_by_rank else (70, 90, 110), 
+                            suit_rect, width=2, border_radius=4)
         suit_text = self.small_font.render("Sort: Suit", True, (255, 255, 255))
-        self.screen.blit(suit_text, (button_x + button_width + 15, button_y + 6))
+        self.view.blit(suit_text, (button_x + button_width + 15, button_y + 6))
 
     def draw_shop_phase(self):
-        self.screen.fill((15, 25, 35))  # Same background as play phase
+        self.view.fill((15, 25, 35))  # Same background as play phase
         
         # Title panel
         title_panel_x = 100
         title_panel_y = 30
         title_panel_width = 1080
         title_panel_height = 80
-        self.draw_panel(self.screen, title_panel_x, title_panel_y, title_panel_width, title_panel_height, (40, 50, 60))
+        self.draw_panel(self.view, title_panel_x, title_panel_y, title_panel_width, title_panel_height, (40, 50, 60))
         
         title_text = self.title_font.render("SHOP", True, (255, 220, 100))
-        title_rect = title_text.get_rect(center=(title_panel_x + title_panel_width//2, title_panel_y + 25))
-        self.screen.blit(title_text, title_rect)
+        self.view.blit(title_text, center=(title_panel_x + title_panel_width//2, title_panel_y + 25))
         
         money_text = self.large_font.render(f"Money: ${self.money}", True, (100, 255, 150))
-        money_rect = money_text.get_rect(center=(title_panel_x + title_panel_width//2, title_panel_y + 60))
-        self.screen.blit(money_text, money_rect)
+        self.view.blit(money_text, center=(title_panel_x + title_panel_width//2, title_panel_y + 60))
         
         instruction_text = self.small_font.render("Press N to continue to next round", True, (200, 200, 220))
-        inst_rect = instruction_text.get_rect(center=(title_panel_x + title_panel_width//2, title_panel_y + title_panel_height - 15))
-        self.screen.blit(instruction_text, inst_rect)
+        self.view.blit(instruction_text, center=(title_panel_x + title_panel_width//2, title_panel_y + title_panel_height - 15))
 
         # Draw shop jokers
         shop_start_y = 150
@@ -779,20 +1222,20 @@ class Game:
             joker_y = shop_start_y + i * joker_spacing
             
             # Joker card background with shadow
-            self.draw_panel(self.screen, joker_x, joker_y, joker_width, joker_height, (250, 220, 50), alpha=255)
+            self.draw_panel(self.view, joker_x, joker_y, joker_width, joker_height, (250, 220, 50), alpha=255)
             
             # Inner border
             joker_rect = pygame.Rect(joker_x + 5, joker_y + 5, joker_width - 10, joker_height - 10)
-            pygame.draw.rect(self.screen, (200, 170, 0), joker_rect, width=2, border_radius=6)
+            self.view.draw_rect((200, 170, 0), joker_rect, width=2, border_radius=6)
             
             # Joker name
             name = joker.type.value[0]
             name_text = self.large_font.render(name, True, (40, 20, 0))
-            self.screen.blit(name_text, (joker_x + 20, joker_y + 15))
+            self.view.blit(name_text, (joker_x + 20, joker_y + 15))
             
             # Cost
             cost_text = self.medium_font.render(f"Cost: ${joker.cost}", True, (150, 100, 0))
-            self.screen.blit(cost_text, (joker_x + 20, joker_y + 55))
+            self.view.blit(cost_text, (joker_x + 20, joker_y + 55))
             
             # Description (split into multiple lines if needed)
             desc = joker.type.value[1]
@@ -813,12 +1256,50 @@ class Game:
             desc_y = joker_y + 90
             for line in desc_lines:
                 desc_text = self.small_font.render(line, True, (80, 60, 0))
-                self.screen.blit(desc_text, (joker_x + 20, desc_y))
+                self.view.blit(desc_text, (joker_x + 20, desc_y))
                 desc_y += 22
             
             # Click instruction
             click_text = self.small_font.render("Click to buy", True, (100, 70, 0))
-            self.screen.blit(click_text, (joker_x + 20, joker_y + joker_height - 30))
+            self.view.blit(click_text, (joker_x + 20, joker_y + joker_height - 30))
+
+        # Owned jokers (left column), right click to sell
+        owned_title = self.medium_font.render("Your Jokers", True, (255, 220, 100))
+        self.view.blit(owned_title, (30, 120))
+        for i, joker in enumerate(self.jokers):
+            jx, jy = 30, 150 + i * 95
+            joker_card_rect = pygame.Rect(jx, jy, 260, 85)
+            self.view.draw_rect((250, 220, 50), joker_card_rect, border_radius=6)
+            self.view.draw_rect((200, 170, 0), joker_card_rect, width=2, border_radius=6)
+            name_text = self.small_font.render(joker.type.value[0], True, (40, 20, 0))
+            self.view.blit(name_text, (jx + 8, jy + 6))
+            desc_text = self.small_font.render(joker.type.value[1][:30], True, (80, 60, 0))
+            self.view.blit(desc_text, (jx + 8, jy + 30))
+            sell_text = self.small_font.render(f"Right click: sell ${joker.cost//2}", True, (100, 50, 0))
+            self.view.blit(sell_text, (jx + 8, jy + 56))
+
+        # Advisor panel (right column)
+        advice = self.shop_advice
+        if advice is None:
+            return
+        advisor_x = 850
+        advisor_y = 150
+        self.draw_panel(self.view, advisor_x, advisor_y, 400, 160, (30, 40, 50))
+        advisor_title = self.medium_font.render("Advisor", True, (255, 220, 100))
+        self.view.blit(advisor_title, (advisor_x + 15, advisor_y + 12))
+        lines = []
+        if advice.sell:
+            lines.append("Sell: " + ", ".join(self.jokers[i].type.value[0] for i in advice.sell))
+        if advice.buy:
+            lines.append("Buy: " + ", ".join(self.shop_jokers[i].type.value[0] for i in advice.buy))
+        if not lines:
+            lines.append("Nothing worth buying, save up")
+        lines.append(f"Money left: ${advice.money}")
+        line_y = advisor_y + 50
+        for line in lines:
+            line_text = self.small_font.render(line, True, (200, 200, 220))
+            self.view.blit(line_text, (advisor_x + 15, line_y))
+            line_y += 24
 
     def update_preview_score(self):
         selected_cards = [card for card in self.hand if card.selected]
@@ -828,81 +1309,8 @@ class Game:
             self.preview_score = 0
             return
 
-        hand_type = self.evaluate_selected_hand(selected_cards)
-        
-        # Start with base values from hand type
-        self.preview_chips = hand_type.chips
-        self.preview_mult = hand_type.mult
-        
-        # Add chips from card values based on hand type
-        non_joker_cards = [c for c in selected_cards if not c.is_joker]
-        
-        # Apply Lucky Joker effect first
-        if any(joker.type == JokerType.LUCKY for joker in self.jokers):
-            for card in non_joker_cards:
-                card.value += 1
-        
-        # Calculate chips based on hand type
-        if hand_type == HandType.HIGH_CARD:
-            highest_card = max(non_joker_cards, key=lambda x: x.value)
-            self.preview_chips += highest_card.get_chip_value()
-        elif hand_type == HandType.PAIR:
-            paired_value = next(value for value, count in Counter([c.value for c in non_joker_cards]).items() if count == 2)
-            paired_cards = [c for c in non_joker_cards if c.value == paired_value]
-            self.preview_chips += sum(c.get_chip_value() for c in paired_cards)
-        elif hand_type == HandType.TWO_PAIR:
-            pairs = [value for value, count in Counter([c.value for c in non_joker_cards]).items() if count == 2]
-            paired_cards = [c for c in non_joker_cards if c.value in pairs]
-            self.preview_chips += sum(c.get_chip_value() for c in paired_cards)
-        elif hand_type == HandType.THREE_OF_A_KIND:
-            three_value = next(value for value, count in Counter([c.value for c in non_joker_cards]).items() if count >= 3)
-            matching_cards = [c for c in non_joker_cards if c.value == three_value][:3]
-            self.preview_chips += sum(c.get_chip_value() for c in matching_cards)
-        elif hand_type in [HandType.STRAIGHT, HandType.FLUSH, HandType.STRAIGHT_FLUSH, HandType.ROYAL_FLUSH]:
-            self.preview_chips += sum(c.get_chip_value() for c in non_joker_cards)
-        elif hand_type == HandType.FULL_HOUSE:
-            self.preview_chips += sum(c.get_chip_value() for c in non_joker_cards)
-        elif hand_type == HandType.FOUR_OF_A_KIND:
-            four_value = next(value for value, count in Counter([c.value for c in non_joker_cards]).items() if count == 4)
-            four_cards = [c for c in non_joker_cards if c.value == four_value]
-            self.preview_chips += sum(c.get_chip_value() for c in four_cards)
-        
-        # Apply chip-adding joker effects
-        for joker in self.jokers:
-            if joker.type == JokerType.LUCKY:
-                self.preview_chips += 10
-            elif joker.type == JokerType.FOOL:
-                self.preview_chips += 5
-            elif joker.type == JokerType.STONE:
-                self.preview_chips += 3
-        
-        # First apply additive multipliers
-        for joker in self.jokers:
-            if joker.type == JokerType.STEEL:
-                self.preview_mult += 2.0
-        
-        # Then apply multiplicative multipliers
-        for joker in self.jokers:
-            if joker.type == JokerType.GLASS and not joker.used:
-                self.preview_mult *= 4.0
-            elif joker.type == JokerType.BRONZE and hand_type == HandType.PAIR:
-                self.preview_mult *= 1.5
-            elif joker.type == JokerType.SILVER and hand_type == HandType.THREE_OF_A_KIND:
-                self.preview_mult *= 2.0
-            elif joker.type == JokerType.GOLD and hand_type == HandType.STRAIGHT:
-                self.preview_mult *= 3.0
-            elif joker.type == JokerType.DIAMOND and hand_type == HandType.FLUSH:
-                self.preview_mult *= 2.5
-            elif joker.type == JokerType.COSMIC:
-                self.preview_mult *= 2.0
-            elif joker.type == JokerType.STONE:
-                self.preview_mult *= 1.5
-        
-        # Reset card values after Lucky Joker effect
-        if any(joker.type == JokerType.LUCKY for joker in self.jokers):
-            for card in non_joker_cards:
-                card.value -= 1
-        
+        # Scoring a hand takes microseconds, on the worker it would only show a tick late
+        _, self.preview_chips, self.preview_mult = score_hand(selected_cards, self.jokers)
         self.preview_score = int(self.preview_chips * self.preview_mult)
 
     def sort_cards(self):
@@ -911,33 +1319,45 @@ class Game:
         else:  # sort by suit
             self.hand.sort(key=lambda card: (card.suit.value, card.value))
     
-    def draw_card(self, surface, x, y, card, selected=False):
+    def draw_card(self, view, x, y, card, selected=False):
         """Draw a professional-looking playing card"""
+        # Each face is drawn once per scale and blitted from then on
+        key = (card.is_joker, card.suit, card.rank, selected, view.scale)
+        face = self.card_faces.get(key)
+        if face is None:
+            face = self.card_faces[key] = self.render_card_face(card, selected)
+        view.blit(face, (x, y))
+
+    def render_card_face(self, card, selected):
+        # The card at (0, 0) with its shadow, on a transparent surface at the view's scale
+        px = self.view.length
+        x = y = 0
+        
         # Card dimensions
-        width = self.card_width
-        height = self.card_height
+        width = px(self.card_width)
+        height = px(self.card_height)
         
         # Shadow
-        shadow_offset = 4
-        shadow_rect = pygame.Rect(x + shadow_offset, y + shadow_offset, width, height)
+        shadow_offset = px(4)
+        surface = pygame.Surface((width + shadow_offset, height + shadow_offset), pygame.SRCALPHA)
         shadow_surf = pygame.Surface((width, height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surf, (0, 0, 0, 100), (0, 0, width, height), border_radius=8)
+        pygame.draw.rect(shadow_surf, (0, 0, 0, 100), (0, 0, width, height), border_radius=px(8))
         surface.blit(shadow_surf, (x + shadow_offset, y + shadow_offset))
         
         # Main card background
         if selected:
             bg_color = (200, 220, 255)  # Light blue when selected
             border_color = (100, 150, 255)
-            border_width = 3
+            border_width = max(1, px(3))
         else:
             bg_color = (255, 255, 255)
             border_color = (0, 0, 0)
-            border_width = 2
+            border_width = max(1, px(2))
         
         # Draw card with rounded corners
         card_rect = pygame.Rect(x, y, width, height)
-        pygame.draw.rect(surface, bg_color, card_rect, border_radius=8)
-        pygame.draw.rect(surface, border_color, card_rect, width=border_width, border_radius=8)
+        pygame.draw.rect(surface, bg_color, card_rect, border_radius=px(8))
+        pygame.draw.rect(surface, border_color, card_rect, width=border_width, border_radius=px(8))
         
         # Draw card content
         if card.is_joker:
@@ -953,7 +1373,7 @@ class Game:
             
             # Get suit symbol and letter
             suit_symbol = card.suit.value
-            suit_letter = {"♥": "H", "♦": "D", "♣": "C", "♠": "S"}.get(suit_symbol, "?")
+            suit_letter = SUIT_LETTERS.get(card.suit, "?")
             
             # Top left rank and suit with letter
             rank_text = self.card_rank_font.render(card.rank, True, text_color)
@@ -961,18 +1381,18 @@ class Game:
             suit_letter_text = self.small_font.render(suit_letter, True, text_color)
             
             # Position at top-left - rank, suit symbol, and letter
-            surface.blit(rank_text, (x + 10, y + 10))
-            surface.blit(suit_text, (x + 10, y + 35))
-            surface.blit(suit_letter_text, (x + 10, y + 58))
+            surface.blit(rank_text, (x + px(10), y + px(10)))
+            surface.blit(suit_text, (x + px(10), y + px(35)))
+            surface.blit(suit_letter_text, (x + px(10), y + px(58)))
             
             # Center suit symbol (much larger and more visible)
             center_suit = self.card_center_font.render(suit_symbol, True, text_color)
-            center_rect = center_suit.get_rect(center=(x + width//2, y + height//2 + 5))
+            center_rect = center_suit.get_rect(center=(x + width//2, y + height//2 + px(5)))
             surface.blit(center_suit, center_rect)
             
             # Add suit letter below center symbol for extra clarity
             center_letter = self.medium_font.render(suit_letter, True, text_color)
-            center_letter_rect = center_letter.get_rect(center=(x + width//2, y + height//2 + 50))
+            center_letter_rect = center_letter.get_rect(center=(x + width//2, y + height//2 + px(50)))
             surface.blit(center_letter, center_letter_rect)
             
             # Bottom right rank and suit (rotated)
@@ -980,27 +1400,38 @@ class Game:
             suit_rotated = pygame.transform.rotate(suit_text, 180)
             suit_letter_rotated = pygame.transform.rotate(suit_letter_text, 180)
             
-            surface.blit(rank_rotated, (x + width - rank_rotated.get_width() - 10, 
-                                       y + height - rank_rotated.get_height() - 10))
-            surface.blit(suit_rotated, (x + width - suit_rotated.get_width() - 10, 
-                                       y + height - suit_rotated.get_height() - 35))
-            surface.blit(suit_letter_rotated, (x + width - suit_letter_rotated.get_width() - 10, 
-                                               y + height - suit_letter_rotated.get_height() - 58))
+            surface.blit(rank_rotated, (x + width - rank_rotated.get_width() - px(10), 
+                                       y + height - rank_rotated.get_height() - px(10)))
+            surface.blit(suit_rotated, (x + width - suit_rotated.get_width() - px(10), 
+                                       y + height - suit_rotated.get_height() - px(35)))
+            surface.blit(suit_letter_rotated, (x + width - suit_letter_rotated.get_width() - px(10), 
+                                               y + height - suit_letter_rotated.get_height() - px(58)))
+        return surface
     
-    def draw_panel(self, surface, x, y, width, height, bg_color=(40, 40, 50), alpha=230):
+    def draw_panel(self, view, x, y, width, height, bg_color=(40, 40, 50), alpha=230):
         """Draw a professional UI panel with shadow"""
-        # Shadow
+        # Drawn once per size, colour and scale, then blitted
+        key = (width, height, bg_color, alpha, view.scale)
+        panel = self.panels.get(key)
+        if panel is None:
+            panel = self.panels[key] = self.render_panel(view, width, height, bg_color, alpha)
+        shadow_surf, panel_surf, shadow_offset = panel
+        view.blit(shadow_surf, (x + shadow_offset, y + shadow_offset))
+        view.blit(panel_surf, (x, y))
+
+    def render_panel(self, view, width, height, bg_color, alpha):
+        # Shadow and panel stay separate, the panel is blended onto whatever is under it
         shadow_offset = 3
-        shadow_rect = pygame.Rect(x + shadow_offset, y + shadow_offset, width, height)
+        width, height, radius = view.length(width), view.length(height), view.length(6)
         shadow_surf = pygame.Surface((width, height), pygame.SRCALPHA)
-        pygame.draw.rect(shadow_surf, (0, 0, 0, 100), (0, 0, width, height), border_radius=6)
-        surface.blit(shadow_surf, (x + shadow_offset, y + shadow_offset))
+        pygame.draw.rect(shadow_surf, (0, 0, 0, 100), (0, 0, width, height), border_radius=radius)
         
         # Main panel
         panel_surf = pygame.Surface((width, height), pygame.SRCALPHA)
         panel_surf.fill((*bg_color, alpha))
-        pygame.draw.rect(panel_surf, (100, 100, 120), (0, 0, width, height), width=2, border_radius=6)
-        surface.blit(panel_surf, (x, y))
+        pygame.draw.rect(panel_surf, (100, 100, 120), (0, 0, width, height),
+                         width=max(1, view.length(2)), border_radius=radius)
+        return shadow_surf, panel_surf, shadow_offset
 
     def calculate_money_reward(self):
         # Base money from hand type
@@ -1018,7 +1449,9 @@ class Game:
             HandType.FULL_HOUSE: 8,
             HandType.FOUR_OF_A_KIND: 10,
             HandType.STRAIGHT_FLUSH: 15,
-            HandType.ROYAL_FLUSH: 20
+            HandType.ROYAL_FLUSH: 20,
+            HandType.FIVE_OF_A_KIND: 12,
+            HandType.FLUSH_FIVE: 25
         }[hand_type]
 
         # Money from jokers
@@ -1031,12 +1464,15 @@ class Game:
         interest = self.calculate_interest()
         
         total_money = base_money + joker_money + hands_left_money + interest
-        print(f"Money breakdown: Base: ${base_money}, Jokers: ${joker_money}, Hands left: ${hands_left_money}, Interest: ${interest}")
+        if self.verbose:
+            print(f"Money breakdown: Base: ${base_money}, Jokers: ${joker_money}, Hands left: ${hands_left_money}, Interest: ${interest}")
         
         return total_money
 
-    def calculate_interest(self):
-        return self.money // 5  # $1 for every $5
+    def calculate_interest(self, money=None):
+        if money is None:
+            money = self.money
+        return calculate_interest(money)
 
     def skip_round(self):
         """Skip the current round and go to the next one"""
@@ -1070,5 +1506,40 @@ class Game:
             card.selected = False
 
 if __name__ == "__main__":
-    game = Game()
-    game.run()
+    import argparse
+    parser = argparse.ArgumentParser(description="Balatro-like")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--telemetry", metavar="DIR", help="Record every played hand to DIR")
+    parser.add_argument("--decks", type=int, default=1, help="Shuffle this many decks together")
+    parser.add_argument("--remove-ranks", default="", metavar="RANKS", help='Ranks left out of the deck, e.g. "2,3"')
+    parser.add_argument("--extra-suits", default="", metavar="SUITS", help='Suits added to the deck, e.g. "stars,moons"')
+    parser.add_argument("--record", metavar="FILE",
+                        help="Save the seed and every action to FILE for replay.py, the game ends at game over")
+    parser.add_argument("--size", type=parse_size, default=LOGICAL_SIZE, metavar="WxH",
+                        help="Window size, the layout scales to fit (default 1280x768)")
+    parser.add_argument("--hand-size", type=int, default=8,
+                        help="Cards dealt to the hand, big hands overlap and scroll")
+    args = parser.parse_args()
+
+    seed = args.seed
+    if args.record and seed is None:
+        # A recording is only replayable with a known seed
+        seed = random.randrange(2 ** 32)
+    deck_spec = DeckSpec.from_args(args.decks, args.remove_ranks, args.extra_suits)
+    game = Game(seed=seed, deck_spec=deck_spec, window_size=args.size, hand_size=args.hand_size)
+    if args.telemetry:
+        from telemetry import TelemetrySink
+        game.set_telemetry(TelemetrySink(args.telemetry, HandType, JokerType))
+    if args.record:
+        game.recording = []
+        game.single_run = True
+    try:
+        game.run()
+    finally:
+        if game.telemetry:
+            game.telemetry.close()
+        if args.record:
+            import json
+            with open(args.record, "w") as f:
+                json.dump({"seed": seed, "deck": deck_spec.to_args(), "hand_size": args.hand_size,
+                           "actions": game.recording}, f)
@@ -0,0 +1,223 @@
+import argparse
+import json
+import math
+import multiprocessing
+import os
+
+from simulation import STRATEGIES, simulate_run
+from tables import get_hand_table
+
+DIFFICULTY_PARAMS = ("base_target", "ante_growth", "round_growth")
+# Where each parameter may go; base_target is searched on a log scale
+SEARCH_RANGES = {"base_target": (10, 20000), "ante_growth": (1.0, 4.0), "round_growth": (1.0, 3.0)}
+
+
+def parse_curve(text):
+    """"1:0.9,4:0.5,8:0.1" -> {1: 0.9, 4: 0.5, 8: 0.1}, the share of runs that should clear each ante"""
+    curve = {}
+    for part in text.split(","):
+        ante, _, rate = part.partition(":")
+        curve[int(ante)] = float(rate)
+    if not all(1 <= ante <= 8 and 0 < rate < 1 for ante, rate in curve.items()):
+        raise ValueError("Curve points must be ante 1-8 with a win rate strictly between 0 and 1")
+    return dict(sorted(curve.items()))
+
+
+def antes_cleared(result):
+    return 8 if result["won"] else result["ante"] - 1
+
+
+def simulate_batch(task):
+    """Worker entry point, returns {seed: antes cleared} for one parameter set"""
+    difficulty, seeds, strategy_name = task
+    strategy = STRATEGIES[strategy_name]()
+    return {seed: antes_cleared(simulate_run(seed, strategy, difficulty=difficulty)) for seed in seeds}
+
+
+class Calibrator:
+    """Fits base_target, ante_growth and round_growth to a requested win-rate curve.
+
+    A rough start comes from bisecting base_target against the first point
+    of the curve and ante_growth against the last one. Then each pass goes
+    over the three parameters in turn, and golden-section searches each one
+    for the smallest worst-point error over the whole curve, in a window
+    around its current value that narrows with every pass. Every evaluation
+    replays the same seeds in the same order (common random numbers), so two
+    nearby parameter sets differ by the parameters and not by luck. Seeds are
+    simulated in batches only until the confidence interval is clear of the
+    target or narrower than the tolerance. Results are cached per (rounded
+    parameters, seed), so revisiting nearby parameters costs nothing, and the
+    cache can be kept on disk between runs.
+    """
+
+    def __init__(self, curve, strategy="greedy", tolerance=0.02, z=1.96,
+                 batch_size=64, max_runs=4096, workers=None, cache_path=None):
+        self.curve = curve
+        self.strategy = strategy
+        self.tolerance = tolerance
+        self.z = z
+        self.batch_size = batch_size
+        self.max_runs = max_runs
+        self.workers = workers or os.cpu_count()
+        self.cache_path = cache_path
+        self.cache = {}
+        self.runs_simulated = 0
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path) as f:
+                self.cache = {key: {int(seed): cleared for seed, cleared in results.items()}
+                              for key, results in json.load(f).items()}
+
+    def save_cache(self):
+        if not self.cache_path:
+            return
+        tmp_path = self.cache_path + ".tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.cache, f, separators=(",", ":"))
+        os.replace(tmp_path, self.cache_path)
+
+    def difficulty(self, base_target, ante_growth, round_growth):
+        # Rounded so nearby parameter values share cached runs
+        return {"base_target": int(round(base_target)), "ante_growth": round(ante_growth, 3),
+                "round_growth": round(round_growth, 3)}
+
+    def cache_key(self, difficulty):
+        return f"{self.strategy}:" + ",".join(str(difficulty[name]) for name in DIFFICULTY_PARAMS)
+
+    def win_rate(self, pool, difficulty, ante, target):
+        """Estimate P(clear ante) with just enough runs to tell it apart from target.
+
+        Returns (rate, half width of the confidence interval, runs used).
+        """
+        results = self.cache.setdefault(self.cache_key(difficulty), {})
+        runs = 0
+        while True:
+            runs = min(runs + self.batch_size, self.max_runs)
+            missing = [seed for seed in range(runs) if seed not in results]
+            if missing:
+                chunk = max(1, len(missing) // self.workers)
+                tasks = [(difficulty, missing[i:i + chunk], self.strategy) for i in range(0, len(missing), chunk)]
+                for batch in pool.imap_unordered(simulate_batch, tasks):
+                    results.update(batch)
+                self.runs_simulated += len(missing)
+            rate = sum(1 for seed in range(runs) if results[seed] >= ante) / runs
+            # Keep the interval honest when every run so far agrees
+            spread = max(rate * (1 - rate), 1 / runs)
+            half_width = self.z * math.sqrt(spread / runs)
+            if abs(rate - target) > half_width or half_width < self.tolerance or runs >= self.max_runs:
+                return rate, half_width, runs
+
+    def curve_error(self, pool, difficulty):
+        """The largest gap between achieved and wanted win rate over every point of the curve"""
+        return max(abs(self.win_rate(pool, difficulty, ante, target)[0] - target)
+                   for ante, target in self.curve.items())
+
+    def bisect(self, pool, name, low, high, ante, target, params, steps):
+        """Bisect one parameter against one curve point; a higher value means a lower win rate"""
+        for _ in range(steps):
+            middle = math.sqrt(low * high) if name == "base_target" else (low + high) / 2
+            rate, half_width, runs = self.win_rate(pool, self.difficulty(**dict(params, **{name: middle})),
+                                                   ante, target)
+            print(f"  {name}={middle:.3f}: ante {ante} win rate {rate:.3f} +/- {half_width:.3f} ({runs} runs)")
+            if abs(rate - target) <= half_width:
+                return middle
+            if rate > target:
+                low = middle
+            else:
+                high = middle
+        return math.sqrt(low * high) if name == "base_target" else (low + high) / 2
+
+    def search_window(self, name, value, calibration_pass):
+        # Around the current value rather than the whole range, which also keeps the
+        # search off the flat stretches where every run wins or every run loses
+        low, high = SEARCH_RANGES[name]
+        if name == "base_target":
+            factor = 1 + 3 / 2 ** calibration_pass
+            return max(low, value / factor), min(high, value * factor)
+        spread = 0.5 / 2 ** calibration_pass
+        return max(low, value - spread), min(high, value + spread)
+
+    def minimize(self, pool, name, low, high, params, steps):
+        """Golden-section search of one parameter for the smallest curve_error.
+
+        Each win rate falls as the parameter grows, so the worst-point error
+        has a single valley to find.
+        """
+        log_scale = name == "base_target"
+        to_value = math.exp if log_scale else float
+        a, b = (math.log(low), math.log(high)) if log_scale else (low, high)
+        ratio = (math.sqrt(5) - 1) / 2
+
+        def error(point):
+            value = to_value(point)
+            result = self.curve_error(pool, self.difficulty(**dict(params, **{name: value})))
+            print(f"  {name}={value:.3f}: worst error {result:.3f}")
+            return result
+
+        c, d = b - ratio * (b - a), a + ratio * (b - a)
+        error_c, error_d = error(c), error(d)
+        for _ in range(steps):
+            if error_c <= error_d:
+                b, d, error_d = d, c, error_c
+                c = b - ratio * (b - a)
+                error_c = error(c)
+            else:
+                a, c, error_c = c, d, error_d
+                d = a + ratio * (b - a)
+                error_d = error(d)
+        return to_value(c if error_c <= error_d else d)
+
+    def calibrate(self, base_target=200, ante_growth=1.5, round_growth=1.2, passes=2, steps=12):
+        first_ante, last_ante = min(self.curve), max(self.curve)
+        params = {"base_target": base_target, "ante_growth": ante_growth, "round_growth": round_growth}
+        get_hand_table()  # Build it once here rather than in every worker
+        with multiprocessing.Pool(self.workers) as pool:
+            try:
+                print("Matching the end points")
+                params["base_target"] = self.bisect(pool, "base_target", *SEARCH_RANGES["base_target"],
+                                                    first_ante, self.curve[first_ante], params, steps)
+                if last_ante != first_ante:
+                    params["ante_growth"] = self.bisect(pool, "ante_growth", *SEARCH_RANGES["ante_growth"],
+                                                        last_ante, self.curve[last_ante], params, steps)
+                    # One point is hit by bisection alone, more need every parameter
+                    for calibration_pass in range(passes):
+                        print(f"Pass {calibration_pass + 1}: fitting every point")
+                        for name in DIFFICULTY_PARAMS:
+                            low, high = self.search_window(name, params[name], calibration_pass)
+                            params[name] = self.minimize(pool, name, low, high, params, steps)
+                difficulty = self.difficulty(**params)
+                achieved = {ante: self.win_rate(pool, difficulty, ante, target)
+                            for ante, target in self.curve.items()}
+            finally:
+                self.save_cache()
+        return difficulty, achieved
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit target score parameters to a win-rate curve")
+    parser.add_argument("curve", help='Share of runs that should clear each ante, e.g. "1:0.9,4:0.5,8:0.1"')
+    parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="optimizer")
+    parser.add_argument("--base-target", type=float, default=200, help="Where the search starts")
+    parser.add_argument("--ante-growth", type=float, default=1.5, help="Where the search starts")
+    parser.add_argument("--round-growth", type=float, default=1.2, help="Where the search starts")
+    parser.add_argument("--tolerance", type=float, default=0.02, help="Confidence interval half width to stop at")
+    parser.add_argument("--confidence-z", type=float, default=1.96)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--max-runs", type=int, default=4096)
+    parser.add_argument("--passes", type=int, default=2)
+    parser.add_argument("--steps", type=int, default=12, help="Search steps per parameter per pass")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", metavar="FILE", help="Keep simulated runs between invocations")
+    args = parser.parse_args()
+
+    calibrator = Calibrator(parse_curve(args.curve), args.strategy, args.tolerance, args.confidence_z,
+                            args.batch_size, args.max_runs, args.workers, args.cache)
+    difficulty, achieved = calibrator.calibrate(args.base_target, args.ante_growth, args.round_growth,
+                                                passes=args.passes, steps=args.steps)
+    print(f"Simulated {calibrator.runs_simulated} runs")
+    print("Parameters:", json.dumps(difficulty))
+    for ante, (rate, half_width, runs) in achieved.items():
+        print(f"  Ante {ante}: {rate:.3f} +/- {half_width:.3f} (wanted {calibrator.curve[ante]}, {runs} runs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+import argparse
+import json
+import os
+import random
+import sys
+import time
+
+# Before pygame is imported, so --json - gets only the JSON
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from Main import LOGICAL_SIZE, DeckSpec, Game, parse_size
+
+# Version 1 recordings have no window size, they were all made at 1280x768
+RECORDING_VERSION = 2
+
+
+def event_to_json(frame, event):
+    """[frame, event name, fields], or None for events the game ignores"""
+    if event.type == pygame.MOUSEBUTTONDOWN:
+        return [frame, "MOUSEBUTTONDOWN", {"pos": list(event.pos), "button": event.button}]
+    elif event.type == pygame.KEYDOWN:
+        return [frame, "KEYDOWN", {"key": event.key}]
+    elif event.type == pygame.MOUSEWHEEL:
+        return [frame, "MOUSEWHEEL", {"x": event.x, "y": event.y}]
+    elif event.type == pygame.VIDEORESIZE:
+        # Clicks are in window pixels, so playback has to resize when the window did
+        return [frame, "VIDEORESIZE", {"size": list(event.size), "w": event.w, "h": event.h}]
+    elif event.type == pygame.QUIT:
+        return [frame, "QUIT", {}]
+    return None
+
+
+def event_from_json(name, fields):
+    for key in ("pos", "size"):
+        if key in fields:
+            fields = dict(fields, **{key: tuple(fields[key])})
+    return pygame.event.Event(getattr(pygame, name), fields)
+
+
+def record(path, seed=None, deck_spec=None, window_size=LOGICAL_SIZE, hand_size=8):
+    """Play the game in a window and save every click, key press and resize with its frame number"""
+    if seed is None:
+        seed = random.randrange(2 ** 32)
+    deck_spec = deck_spec or DeckSpec()
+    game = Game(seed=seed, deck_spec=deck_spec, window_size=window_size, hand_size=hand_size)
+    game.single_run = True  # A new run after game over would have an unknown seed
+    events = []
+    frame = 0
+    try:
+        # Game.run, with the input captured on the way into handle_events
+        while game.running:
+            frame_events = pygame.event.get()
+            for event in frame_events:
+                data = event_to_json(frame, event)
+                if data is not None:
+                    events.append(data)
+            game.handle_events(frame_events)
+            game.update()
+            game.draw()
+            game.clock.tick(60)
+            frame += 1
+    finally:
+        with open(path, "w") as f:
+            json.dump({"version": RECORDING_VERSION, "seed": seed, "deck": deck_spec.to_args(),
+                       "window": list(window_size), "hand_size": hand_size, "frames": frame,
+                       "events": events}, f)
+        pygame.quit()
+    print(f"Recorded {len(events)} events over {frame} frames")
+
+
+def play(recording, game):
+    """Feed a recording through the event queue, handle_events and the draw path as fast as possible.
+
+    Returns the (seconds, had input) of every frame.
+    """
+    window_size = tuple(recording.get("window", LOGICAL_SIZE))
+    if game.screen.get_size() != window_size:
+        game.set_screen(pygame.display.set_mode(window_size, pygame.RESIZABLE))
+    game.deck_spec = DeckSpec.from_args(**recording.get("deck", {}))
+    game.starting_hand_size = recording.get("hand_size", 8)
+    game.reset(recording["seed"])
+    game.running = True
+    by_frame = {}
+    for frame, name, fields in recording["events"]:
+        by_frame.setdefault(frame, []).append(event_from_json(name, fields))
+
+    timings = []
+    pygame.event.clear()
+    for frame in range(recording["frames"]):
+        if not game.running:
+            break
+        frame_events = by_frame.get(frame, ())
+        started = time.perf_counter()
+        for event in frame_events:
+            if event.type == pygame.VIDEORESIZE:
+                # What the OS did to the window, the dummy driver has none to resize
+                pygame.display.set_mode(event.size, pygame.RESIZABLE)
+            pygame.event.post(event)
+        game.handle_events()
+        game.update()
+        game.draw()
+        timings.append((time.perf_counter() - started, bool(frame_events)))
+    return timings
+
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def summarize(seconds):
+    values = sorted(seconds)
+    return {
+        "frames": len(values),
+        "mean_ms": 1000 * sum(values) / len(values) if values else 0.0,
+        "p50_ms": 1000 * percentile(values, 0.5),
+        "p90_ms": 1000 * percentile(values, 0.9),
+        "p99_ms": 1000 * percentile(values, 0.99),
+        "max_ms": 1000 * values[-1] if values else 0.0,
+    }
+
+
+def benchmark(paths, repeat=1):
+    """Play every recording `repeat` times, returns latency summaries for all/input/idle frames"""
+    recordings = []
+    for path in paths:
+        with open(path) as f:
+            recording = json.load(f)
+        if recording.get("version") not in (1, RECORDING_VERSION):
+            raise ValueError(f"{path}: unsupported recording version {recording.get('version')}")
+        recordings.append(recording)
+
+    game = Game(seed=recordings[0]["seed"])
+    game.verbose = False
+    game.single_run = True
+    timings = []
+    for _ in range(repeat):
+        for recording in recordings:
+            timings.extend(play(recording, game))
+    pygame.quit()
+    return {
+        "all": summarize([seconds for seconds, _ in timings]),
+        "input": summarize([seconds for seconds, had_input in timings if had_input]),
+        "idle": summarize([seconds for seconds, had_input in timings if not had_input]),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record input from a real session, or play it back uncapped")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    record_parser = commands.add_parser("record", help="Play in a window and save the input")
+    record_parser.add_argument("output")
+    record_parser.add_argument("--seed", type=int, default=None)
+    record_parser.add_argument("--decks", type=int, default=1)
+    record_parser.add_argument("--remove-ranks", default="", metavar="RANKS")
+    record_parser.add_argument("--extra-suits", default="", metavar="SUITS")
+    record_parser.add_argument("--size", type=parse_size, default=LOGICAL_SIZE, metavar="WxH",
+                               help="Starting window size")
+    record_parser.add_argument("--hand-size", type=int, default=8, help="Cards dealt to the hand")
+
+    play_parser = commands.add_parser("play", help="Replay recordings and report per-frame latency")
+    play_parser.add_argument("recordings", nargs="+")
+    play_parser.add_argument("--repeat", type=int, default=1)
+    play_parser.add_argument("--window", action="store_true", help="Draw to a real window instead of SDL's dummy driver")
+    play_parser.add_argument("--json", metavar="FILE", help="Also write the summary as JSON, - for stdout")
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.output, args.seed, DeckSpec.from_args(args.decks, args.remove_ranks, args.extra_suits),
+               args.size, args.hand_size)
+        return
+
+    if not args.window:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    results = benchmark(args.recordings, args.repeat)
+    if args.json == "-":
+        json.dump(results, sys.stdout, indent=2)
+        print()
+        return
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    for name, summary in results.items():
+        print(f"{name:>6}: {summary['frames']:6d} frames  mean {summary['mean_ms']:.3f}ms  "
+              f"p50 {summary['p50_ms']:.3f}  p90 {summary['p90_ms']:.3f}  "
+              f"p99 {summary['p99_ms']:.3f}  max {summary['max_ms']:.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+import argparse
+import functools
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+import weakref
+
+# Before pygame is imported
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from Main import Game
+
+# Game methods whose allocations are attributed to them, nested calls count towards both
+TRACKED_METHODS = [
+    "handle_events", "update", "draw", "draw_play_phase", "draw_shop_phase",
+    "draw_card", "render_card_face", "draw_panel", "render_panel", "create_deck", "deal_initial_hand",
+    "calculate_score", "update_preview_score", "play_hand", "discard_selected_cards",
+    "get_shop_advice", "win_round", "next_round", "reset",
+]
+
+
+class CountingSurface(pygame.Surface):
+    """Stands in for pygame.Surface while tracking, counts surfaces made and still alive"""
+
+    created = 0
+    alive = weakref.WeakSet()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        CountingSurface.created += 1
+        CountingSurface.alive.add(self)
+
+
+class AllocationTracker:
+    """Attributes memory to game phases and methods, and logs snapshots as JSON lines.
+
+    Each call of a TRACKED_METHODS method adds its net allocation (what it
+    left behind) and its peak above the starting point (what it needed
+    while running) to that method's totals, keyed by game phase. With
+    tracemalloc these are bytes. With use_tracemalloc=False they are
+    sys.getallocatedblocks() counts, which is far cheaper but gives no peak
+    (records leave the peak fields out) and no per-line snapshots.
+    pygame.Surface is swapped for CountingSurface and GC pauses are timed
+    through gc.callbacks.
+
+    Every `interval` frames, and whenever the round changes, one record goes
+    to the output with the totals since the last record. With tracemalloc it
+    also holds the `top` source lines whose allocations grew the most since
+    the previous record of the same kind.
+    """
+
+    def __init__(self, out, interval=300, top=10, use_tracemalloc=True, traceback_frames=1):
+        self.out = out
+        self.interval = interval
+        self.top = top
+        self.use_tracemalloc = use_tracemalloc
+        self.traceback_frames = traceback_frames
+        self.frame = 0
+        self.round = None
+        self.started = time.perf_counter()
+        self.stack = []  # [start, peak] of the tracked calls in progress
+        self.originals = {}
+        self.snapshots = {}
+        self.reset_totals()
+
+    def reset_totals(self):
+        self.functions = {}
+        self.gc_pauses = {}
+        self.gc_started = None
+        self.surfaces_created = CountingSurface.created
+        self.frames_since = 0
+
+    def start(self):
+        if self.use_tracemalloc:
+            tracemalloc.start(self.traceback_frames)
+        for name in TRACKED_METHODS:
+            self.originals[name] = getattr(Game, name)
+            setattr(Game, name, self.wrap(name, self.originals[name]))
+        self.originals["Surface"] = pygame.Surface
+        pygame.Surface = CountingSurface
+        gc.callbacks.append(self.on_gc)
+
+    def stop(self):
+        gc.callbacks.remove(self.on_gc)
+        pygame.Surface = self.originals.pop("Surface")
+        for name, method in self.originals.items():
+            setattr(Game, name, method)
+        self.originals = {}
+        if self.use_tracemalloc:
+            tracemalloc.stop()
+
+    def memory(self):
+        if self.use_tracemalloc:
+            return tracemalloc.get_traced_memory()
+        blocks = sys.getallocatedblocks()
+        return blocks, blocks
+
+    def wrap(self, name, method):
+        tracker = self
+
+        @functools.wraps(method)
+        def tracked(game, *args, **kwargs):
+            tracker.enter()
+            try:
+                return method(game, *args, **kwargs)
+            finally:
+                tracker.exit(game, name)
+        return tracked
+
+    def enter(self):
+        current, peak = self.memory()
+        if self.stack:
+            # The caller's peak so far, before it's reset for this call
+            self.stack[-1][1] = max(self.stack[-1][1], peak)
+        if self.use_tracemalloc:
+            tracemalloc.reset_peak()
+        self.stack.append([current, current])
+
+    def exit(self, game, name):
+        current, peak = self.memory()
+        start, call_peak = self.stack.pop()
+        call_peak = max(call_peak, peak)
+        if self.stack:
+            self.stack[-1][1] = max(self.stack[-1][1], call_peak)
+        # Phase "setup" while the first reset() is still building the game
+        key = f"{getattr(game, 'phase', 'setup')}:{name}"
+        totals = self.functions.get(key)
+        if totals is None:
+            totals = self.functions[key] = {"calls": 0, "net": 0}
+            if self.use_tracemalloc:
+                totals["peak"] = 0
+        totals["calls"] += 1
+        totals["net"] += current - start
+        if self.use_tracemalloc:
+            totals["peak"] = max(totals["peak"], call_peak - start)
+        if name == "draw" and not self.stack:
+            self.end_frame(game)
+
+    def on_gc(self, phase, info):
+        if phase == "start":
+            self.gc_started = time.perf_counter()
+            return
+        if self.gc_started is None:
+            return
+        pause = time.perf_counter() - self.gc_started
+        self.gc_started = None
+        totals = self.gc_pauses.setdefault(str(info["generation"]), {"count": 0, "total_ms": 0.0, "max_ms": 0.0})
+        totals["count"] += 1
+        totals["total_ms"] += pause * 1000
+        totals["max_ms"] = max(totals["max_ms"], pause * 1000)
+
+    def end_frame(self, game):
+        self.frame += 1
+        self.frames_since += 1
+        if self.round is None:
+            self.round = game.round
+        if game.round != self.round:
+            self.round = game.round
+            self.write("round", game)
+        elif self.frame % self.interval == 0:
+            self.write("frame", game)
+
+    def top_growth(self, kind):
+        """The source lines that grew most since the last snapshot of this kind"""
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        previous = self.snapshots.get(kind)
+        self.snapshots[kind] = snapshot
+        if previous is None:
+            stats = snapshot.statistics("lineno")[:self.top]
+            return [{"where": str(stat.traceback), "size": stat.size, "count": stat.count} for stat in stats]
+        stats = snapshot.compare_to(previous, "lineno")[:self.top]
+        return [{"where": str(stat.traceback), "size": stat.size, "size_diff": stat.size_diff,
+                 "count_diff": stat.count_diff} for stat in stats]
+
+    def write(self, kind, game, final=False):
+        current, peak = self.memory()
+        record = {
+            "kind": kind,
+            "frame": self.frame,
+            "frames": self.frames_since,
+            "seconds": round(time.perf_counter() - self.started, 3),
+            "phase": game.phase,
+            "ante": game.ante,
+            "round": game.round,
+            "unit": "bytes" if self.use_tracemalloc else "blocks",
+            "current": current,
+            "surfaces_created": CountingSurface.created - self.surfaces_created,
+            "surfaces_alive": len(CountingSurface.alive),
+            "gc": self.gc_pauses,
+            "functions": self.functions,
+        }
+        if self.use_tracemalloc:
+            # Block counts have no peak, so counters-only records leave it out
+            record["peak"] = peak
+            if not final:
+                record["top_growth"] = self.top_growth(kind)
+        self.out.write(json.dumps(record) + "\n")
+        self.out.flush()
+        self.reset_totals()
+        if self.use_tracemalloc:
+            tracemalloc.reset_peak()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Attribute allocations to game phases and methods")
+    parser.add_argument("output", help="JSON lines file, one record per interval and per round")
+    parser.add_argument("--recordings", nargs="+", metavar="FILE",
+                        help="Play back input_bench.py recordings headlessly instead of opening a window")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--interval", type=int, default=300, help="Frames between records")
+    parser.add_argument("--top", type=int, default=10, help="Source lines listed per record")
+    parser.add_argument("--traceback-frames", type=int, default=1,
+                        help="Stack depth tracemalloc keeps per allocation, more is slower")
+    parser.add_argument("--counters-only", action="store_true",
+                        help="Skip tracemalloc, count allocated blocks, surfaces and GC pauses only")
+    args = parser.parse_args()
+
+    if args.recordings:
+        os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+    with open(args.output, "w") as out:
+        tracker = AllocationTracker(out, args.interval, args.top, not args.counters_only, args.traceback_frames)
+        tracker.start()
+        game = None
+        try:
+            if args.recordings:
+                from input_bench import play
+                game = Game()
+                game.verbose = False
+                game.single_run = True
+                for path in args.recordings:
+                    with open(path) as f:
+                        play(json.load(f), game)
+            else:
+                game = Game(seed=args.seed)
+                game.run()
+        finally:
+            if game is not None:
+                tracker.write("end", game, final=True)
+            tracker.stop()
+
+
+if __name__ == "__main__":
+    main()
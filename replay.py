@@ -0,0 +1,110 @@
+import argparse
+import json
+import os
+import sys
+
+# Before pygame is imported: no window, and nothing but frames on stdout
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import pygame
+
+from Main import LOGICAL_SIZE, DeckSpec, Game, parse_size
+
+
+def load_recording(path):
+    """Read a recording saved by Main.py --record, returns (seed, actions, deck spec, hand size)"""
+    with open(path) as f:
+        data = json.load(f)
+    # Recordings from before custom decks have no "deck", or "hand_size" before that was an option
+    deck_spec = DeckSpec.from_args(**data.get("deck", {}))
+    actions = [(action, index) for action, index in data["actions"]]
+    return data["seed"], actions, deck_spec, data.get("hand_size", 8)
+
+
+class FrameRenderer:
+    """Replays recorded runs and writes every state out as raw rgb24 frames.
+
+    The game draws straight into a surface made with pygame.image.frombuffer
+    over one bytearray, whose memory is already width x height rgb24 rows top
+    to bottom, so a finished frame goes to the output as-is: no conversion,
+    no copy, and the same buffer for every frame of every run. Any size
+    renders natively, the game lays itself out for the surface it's given.
+    Each state is held for `hold` frames so the video can be watched.
+    """
+
+    def __init__(self, out, hold=15, final_hold=60, size=LOGICAL_SIZE):
+        self.out = out
+        self.hold = hold
+        self.final_hold = final_hold
+        self.frames = 0
+        self.size = size
+        self.buffer = bytearray(size[0] * size[1] * 3)
+        self.view = memoryview(self.buffer)
+        self.surface = pygame.image.frombuffer(self.buffer, size, "RGB")
+        self.game = None
+
+    def emit(self, count):
+        self.game.draw_frame()
+        for _ in range(count):
+            self.out.write(self.view)
+        self.frames += count
+
+    def replay(self, seed, actions, deck_spec=None, hand_size=8):
+        if self.game is None:
+            # One game for every run, reset() keeps the fonts and card art
+            self.game = Game(seed=seed, deck_spec=deck_spec, hand_size=hand_size)
+            self.game.verbose = False
+            self.game.single_run = True
+            self.game.set_screen(self.surface)
+        else:
+            self.game.deck_spec = deck_spec or DeckSpec()
+            self.game.starting_hand_size = hand_size
+            self.game.reset(seed)
+        self.game.running = True
+
+        self.emit(self.hold)
+        for action, index in actions:
+            if not self.game.running:
+                break
+            # Refused actions (a click on nothing) leave the picture unchanged
+            if self.game.apply_action(action, index):
+                self.emit(self.hold)
+        self.emit(self.final_hold)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Render recorded runs to raw rgb24 frames",
+        epilog=f"Example: python replay.py run.json | ffmpeg -f rawvideo -pixel_format rgb24 "
+               f"-video_size 1280x768 -framerate 30 -i - run.mp4 (-video_size must match --size)")
+    parser.add_argument("recordings", nargs="+", help="Files saved by Main.py --record, rendered back to back")
+    parser.add_argument("--output", default="-", help="File or named pipe to write frames to (default stdout)")
+    parser.add_argument("--hold", type=int, default=15, help="Frames to show each state for")
+    parser.add_argument("--final-hold", type=int, default=60, help="Frames to show the last state of a run for")
+    parser.add_argument("--size", type=parse_size, default=LOGICAL_SIZE, metavar="WxH",
+                        help="Frame size, e.g. 3840x2160 (default 1280x768)")
+    args = parser.parse_args()
+
+    out = sys.stdout.buffer if args.output == "-" else open(args.output, "wb")
+    renderer = FrameRenderer(out, args.hold, args.final_hold, args.size)
+    try:
+        for path in args.recordings:
+            renderer.replay(*load_recording(path))
+        out.flush()
+    except BrokenPipeError:
+        # The encoder went away, nobody is left to read the rest
+        sys.stderr.write("Output closed early\n")
+        if out is sys.stdout.buffer:
+            # Stop the interpreter's own flush of stdout failing again on exit
+            os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        sys.exit(1)
+    finally:
+        if out is not sys.stdout.buffer:
+            out.close()
+    width, height = args.size
+    sys.stderr.write(f"Wrote {renderer.frames} frames, {width}x{height} rgb24\n")
+
+
+if __name__ == "__main__":
+    main()
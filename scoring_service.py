@@ -0,0 +1,223 @@
+import argparse
+import asyncio
+import json
+import os
+from collections import OrderedDict
+
+from Main import Joker, JokerType, apply_jokers
+from tables import DECK_SIZE, ENTRY_SIZE, HAND_TYPES, MAX_CARDS, get_hand_table, subset_index
+
+
+def cards_to_mask(codes):
+    mask = 0
+    for code in codes:
+        if not isinstance(code, int) or isinstance(code, bool):
+            raise ValueError(f"card code must be an integer: {code!r}")
+        if not 0 <= code < DECK_SIZE:
+            raise ValueError(f"card code out of range: {code}")
+        if mask & (1 << code):
+            # A mask can't hold a card twice, and the cards would score differently with it
+            raise ValueError(f"duplicate card code: {code}")
+        mask |= 1 << code
+    return mask
+
+
+def mask_to_codes(mask):
+    """Set bits of a card mask in ascending order, which is what the hand table wants"""
+    codes = []
+    while mask:
+        low = mask & -mask
+        codes.append(low.bit_length() - 1)
+        mask ^= low
+    return codes
+
+
+class ScoringService:
+    """Scores card sets under joker loadouts, the same numbers as Game.calculate_score.
+
+    Requests arriving within `window` seconds of each other are answered from
+    one batch: duplicates are folded together, cached results are reused, and
+    the rest are looked up in the shared hand table grouped by loadout, so the
+    joker maths runs once per (loadout, hand shape) rather than once per request.
+    Glass jokers in a loadout count as unused, like the first hand of a round.
+    A connection stops being read while max_in_flight of its requests are
+    unanswered or their replies are waiting for the client to read them.
+    """
+
+    def __init__(self, window=0.002, max_batch=1024, cache_size=100000, max_in_flight=256):
+        self.window = window
+        self.max_batch = max_batch
+        self.max_in_flight = max_in_flight
+        self.cache_size = cache_size
+        self.cache = OrderedDict()
+        self.pending = []
+        self.flush_handle = None
+        self.table = get_hand_table()
+        self.batches = 0
+        self.requests = 0
+
+    def parse(self, request):
+        """Return the (mask, loadout) cache key for a request"""
+        if "mask" in request:
+            mask = int(request["mask"])
+            if mask < 0 or mask >> DECK_SIZE:
+                raise ValueError("mask has bits outside the deck")
+        else:
+            cards = request.get("cards", [])
+            if not isinstance(cards, list):
+                raise ValueError("cards must be a list of card codes")
+            mask = cards_to_mask(cards)
+        if bin(mask).count("1") > MAX_CARDS:
+            raise ValueError(f"at most {MAX_CARDS} cards can be scored")
+        jokers = request.get("jokers", [])
+        if not isinstance(jokers, list):
+            raise ValueError("jokers must be a list of joker names")
+        try:
+            loadout = tuple(JokerType[name] for name in jokers)
+        except KeyError as e:
+            raise ValueError(f"unknown joker {e}") from None
+        return mask, loadout
+
+    async def score(self, mask, loadout):
+        key = (mask, loadout)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.cache.move_to_end(key)
+            return cached
+        future = asyncio.get_running_loop().create_future()
+        self.pending.append((key, future))
+        if len(self.pending) >= self.max_batch:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = asyncio.get_running_loop().call_later(self.window, self.flush)
+        return await future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+        pending, self.pending = self.pending, []
+        if not pending:
+            return
+        self.batches += 1
+        self.requests += len(pending)
+
+        results = self.evaluate(set(key for key, _ in pending))
+        for key, future in pending:
+            if not future.done():
+                future.set_result(results[key])
+
+    def evaluate(self, keys):
+        """Score a batch of distinct (mask, loadout) keys and add them to the cache"""
+        results = {}
+        by_loadout = {}
+        for key in keys:
+            cached = self.cache.get(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                by_loadout.setdefault(key[1], []).append(key[0])
+
+        data = self.table.data
+        for loadout, masks in by_loadout.items():
+            jokers = [Joker(joker_type) for joker_type in loadout]
+            # Many masks share a hand shape (type, card chips, scoring count)
+            by_entry = {}
+            for mask in masks:
+                if not mask:
+                    # Nothing selected scores 0, like Game.calculate_score
+                    results[(mask, loadout)] = {"hand_type": None, "chips": 0, "mult": 0, "score": 0}
+                    continue
+                offset = subset_index(mask_to_codes(mask)) * ENTRY_SIZE
+                entry = bytes(data[offset:offset + ENTRY_SIZE])
+                result = by_entry.get(entry)
+                if result is None:
+                    hand_type = HAND_TYPES[entry[0]]
+                    chips, mult = apply_jokers(jokers, hand_type, entry[1], entry[2])
+                    result = by_entry[entry] = {"hand_type": hand_type.label, "chips": chips,
+                                                "mult": mult, "score": int(chips * mult)}
+                results[(mask, loadout)] = result
+
+        for key in keys:
+            self.cache[key] = results[key]
+            self.cache.move_to_end(key)
+        while len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return results
+
+    async def handle_line(self, line, writer):
+        request = None
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError("request must be a JSON object")
+            reply = dict(await self.score(*self.parse(request)))
+        except (ValueError, TypeError) as e:
+            reply = {"error": f"bad request: {e}"}
+        if isinstance(request, dict) and "id" in request:
+            reply["id"] = request["id"]
+        writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass  # handle_client sees the connection go too
+
+    async def handle_client(self, reader, writer):
+        # Requests on one connection are answered as they complete, match them up by "id"
+        tasks = set()
+        slots = asyncio.Semaphore(self.max_in_flight)
+
+        def finished(task):
+            tasks.discard(task)
+            slots.release()
+
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                # A client that sends faster than it reads waits here
+                await slots.acquire()
+                task = asyncio.ensure_future(self.handle_line(line, writer))
+                tasks.add(task)
+                task.add_done_callback(finished)
+            if tasks:
+                await asyncio.wait(tasks)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host="127.0.0.1", port=8766, unix_path=None):
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        async with server:
+            await server.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch hand scoring service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--window-ms", type=float, default=2.0,
+                        help="How long to collect requests before scoring them together")
+    parser.add_argument("--cache-size", type=int, default=100000)
+    parser.add_argument("--max-in-flight", type=int, default=256,
+                        help="Unanswered requests per connection before it stops being read")
+    args = parser.parse_args()
+
+    service = ScoringService(window=args.window_ms / 1000, cache_size=args.cache_size,
+                             max_in_flight=args.max_in_flight)
+    try:
+        asyncio.run(service.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
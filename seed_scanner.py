@@ -0,0 +1,197 @@
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+from itertools import combinations
+
+from Main import RANKS, STANDARD_SUITS, Game, HandType, JokerType, card_from_code
+from tables import get_hand_table
+
+DECK_CODES = list(range(len(STANDARD_SUITS) * len(RANKS)))  # Seeds are scanned for the standard deck
+VALUES = [card_from_code(code).value for code in DECK_CODES]
+SUITS = [code // len(RANKS) for code in DECK_CODES]
+JOKER_TYPES = list(JokerType)
+HAND_TYPES = list(HandType)
+HAND_SIZE = 8  # Game.hand_size
+# A straight flush is a straight and a flush too, the table only reports the best type
+ALSO_MATCHES = {
+    HandType.STRAIGHT: (HandType.STRAIGHT_FLUSH, HandType.ROYAL_FLUSH),
+    HandType.FLUSH: (HandType.STRAIGHT_FLUSH, HandType.ROYAL_FLUSH),
+    HandType.STRAIGHT_FLUSH: (HandType.ROYAL_FLUSH,),
+}
+
+
+class Opening:
+    """The parts of a seeded game the queries look at, built without creating a Game.
+
+    This mirrors the order Game.reset() and the first win_round() use the RNG:
+    one shuffle of the deck in create_deck order, eight pops for the hand,
+    three rolls for the initial shop, three more for the shop after round 1.
+    verify() checks that against real games.
+    """
+
+    __slots__ = ("seed", "deck", "hand", "rank_counts", "suit_counts", "shop")
+
+    def __init__(self, rng, seed, with_shop):
+        rng.seed(seed)
+        self.seed = seed
+        deck = DECK_CODES[:]
+        rng.shuffle(deck)
+        self.deck = deck
+        # deal_initial_hand pops from the end
+        self.hand = deck[-1:-HAND_SIZE - 1:-1]
+        self.rank_counts = [0] * 15
+        self.suit_counts = [0] * len(STANDARD_SUITS)
+        for code in self.hand:
+            self.rank_counts[VALUES[code]] += 1
+            self.suit_counts[SUITS[code]] += 1
+        self.shop = None
+        if with_shop:
+            rolls = [rng.choice(JOKER_TYPES) for _ in range(6)]
+            self.shop = rolls[3:]
+
+    def next_draws(self, count):
+        """Cards the first discard would draw, in order"""
+        return self.deck[-HAND_SIZE - 1:-HAND_SIZE - 1 - count:-1]
+
+
+def verify(seeds=range(20)):
+    """Make sure Opening still matches what Game deals, raises if the rules drifted"""
+    rng = random.Random()
+    for seed in seeds:
+        opening = Opening(rng, seed, with_shop=True)
+        game = Game(seed=seed, headless=True)
+        if sorted(card.get_code() for card in game.hand) != sorted(opening.hand):
+            raise RuntimeError(f"Seed {seed}: opening hand doesn't match Game, update Opening")
+        if [card.get_code() for card in game.deck[-5:]][::-1] != opening.next_draws(5):
+            raise RuntimeError(f"Seed {seed}: deck order doesn't match Game, update Opening")
+        game.win_round()
+        if [joker.type for joker in game.shop_jokers] != opening.shop:
+            raise RuntimeError(f"Seed {seed}: first shop doesn't match Game, update Opening")
+
+
+def has_hand_type(opening, hand_type):
+    """True if some 1-5 card subset of the opening hand plays as hand_type or a hand containing it"""
+    counts = sorted(opening.rank_counts, reverse=True)
+    # Rank multiples can be checked from the counts alone
+    if hand_type == HandType.HIGH_CARD:
+        return True
+    elif hand_type == HandType.PAIR:
+        return counts[0] >= 2
+    elif hand_type == HandType.TWO_PAIR:
+        return counts[1] >= 2
+    elif hand_type == HandType.THREE_OF_A_KIND:
+        return counts[0] >= 3
+    elif hand_type == HandType.FULL_HOUSE:
+        return counts[0] >= 3 and counts[1] >= 2
+    elif hand_type == HandType.FOUR_OF_A_KIND:
+        return counts[0] >= 4
+    elif hand_type in (HandType.FIVE_OF_A_KIND, HandType.FLUSH_FIVE):
+        return False  # Needs the same card twice, a single deck can't
+
+    # Straights and flushes: cheap necessary condition first, then the table
+    if hand_type in (HandType.FLUSH, HandType.STRAIGHT_FLUSH, HandType.ROYAL_FLUSH):
+        if max(opening.suit_counts) < 5:
+            return False
+    if hand_type in (HandType.STRAIGHT, HandType.STRAIGHT_FLUSH, HandType.ROYAL_FLUSH):
+        run = best = 0
+        for count in opening.rank_counts:
+            run = run + 1 if count else 0
+            best = max(best, run)
+        if best < 5:
+            return False
+    table = get_hand_table()
+    wanted = (hand_type,) + ALSO_MATCHES.get(hand_type, ())
+    for codes in combinations(sorted(opening.hand), 5):
+        if table.lookup_codes(codes)[0] in wanted:
+            return True
+    return False
+
+
+def flush_after_discard(opening):
+    """True if five cards of one suit can be held after at most one discard"""
+    for suit, held in enumerate(opening.suit_counts):
+        if held >= 5:
+            return True
+        # Best case: discard only off-suit cards, as many as allowed (5 per discard)
+        draws = opening.next_draws(min(5, HAND_SIZE - held))
+        if held + sum(1 for code in draws if SUITS[code] == suit) >= 5:
+            return True
+    return False
+
+
+def parse_query(term):
+    """Turn "hand:FOUR_OF_A_KIND", "shop:COSMIC" or "flush_after_discard" into a check"""
+    name, _, arg = term.partition(":")
+    if name == "hand":
+        hand_type = HandType[arg.upper()]
+        return (lambda opening: has_hand_type(opening, hand_type)), False
+    elif name == "shop":
+        joker_type = JokerType[arg.upper()]
+        return (lambda opening: joker_type in opening.shop), True
+    elif name == "flush_after_discard":
+        return flush_after_discard, False
+    raise ValueError(f"Unknown query {term!r}")
+
+
+def scan_block(task):
+    """Worker entry point, returns the seeds in [start, stop) matching every term"""
+    start, stop, terms = task
+    checks = [parse_query(term) for term in terms]
+    with_shop = any(needs_shop for _, needs_shop in checks)
+    rng = random.Random()
+    matches = []
+    for seed in range(start, stop):
+        opening = Opening(rng, seed, with_shop)
+        if all(check(opening) for check, _ in checks):
+            matches.append(seed)
+    return matches
+
+
+def scan(terms, start, stop, block_size=100000, workers=None, limit=None):
+    """Yield matching seeds in ascending order"""
+    for term in terms:
+        parse_query(term)  # Fail fast on typos before starting the pool
+    if any(term.startswith("hand:") for term in terms):
+        get_hand_table()  # Build once here instead of in every worker
+    tasks = [(block_start, min(block_start + block_size, stop), terms)
+             for block_start in range(start, stop, block_size)]
+    found = 0
+    with multiprocessing.Pool(workers or os.cpu_count()) as pool:
+        for matches in pool.imap(scan_block, tasks):
+            for seed in matches:
+                yield seed
+                found += 1
+                if limit is not None and found >= limit:
+                    return
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Find seeds whose opening matches every query term",
+        epilog="Terms: hand:<HandType name> (playable from the opening hand, a full house counts "
+               "as a pair and a straight flush as a straight and a flush), "
+               "shop:<JokerType name> (offered in the shop after round 1), "
+               "flush_after_discard")
+    parser.add_argument("terms", nargs="+")
+    parser.add_argument("--start", type=int, default=0)
+    parser.add_argument("--stop", type=int, default=1000000)
+    parser.add_argument("--block-size", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--limit", type=int, default=None, help="Stop after this many matches")
+    args = parser.parse_args()
+
+    verify()
+    started = time.perf_counter()
+    count = 0
+    for seed in scan(args.terms, args.start, args.stop, args.block_size, args.workers, args.limit):
+        print(seed)
+        count += 1
+    elapsed = time.perf_counter() - started
+    print(f"{count} matches in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
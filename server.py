@@ -0,0 +1,229 @@
+import argparse
+import asyncio
+import json
+import os
+import secrets
+import time
+import zlib
+
+from Main import DeckSpec, Game, Joker, JokerType, card_from_code
+
+# Plain attributes copied as-is when a session is evicted and restored
+STATE_FIELDS = [
+    "seed", "sort_by_rank", "money", "base_mult", "current_score", "hand_size",
+    "preview_score", "preview_chips", "preview_mult", "max_selected", "max_jokers",
+    "phase", "discards_remaining", "hands_remaining", "round", "ante", "ante_round",
+    "base_target", "ante_growth", "round_growth", "target_score", "round_complete", "running",
+]
+JOKER_TYPES = list(JokerType)
+
+
+def snapshot_game(game):
+    """Everything needed to continue a headless game later, as plain JSON types"""
+    version, internal, gauss = game.rng.getstate()
+    data = {field: getattr(game, field) for field in STATE_FIELDS}
+    data["rng"] = [version, list(internal), gauss]
+    data["deck_spec"] = game.deck_spec.to_args()
+    data["deck"] = [card.get_code() for card in game.deck]
+    data["discard_pile"] = [card.get_code() for card in game.discard_pile]
+    data["hand"] = [card.get_code() for card in game.hand]
+    data["selected"] = [i for i, card in enumerate(game.hand) if card.selected]
+    data["jokers"] = [[JOKER_TYPES.index(joker.type), joker.used] for joker in game.jokers]
+    data["shop_jokers"] = [JOKER_TYPES.index(joker.type) for joker in game.shop_jokers]
+    return data
+
+
+def restore_game(data):
+    game = Game(headless=True, deck_spec=DeckSpec.from_args(**data["deck_spec"]))
+    for field in STATE_FIELDS:
+        setattr(game, field, data[field])
+    version, internal, gauss = data["rng"]
+    game.rng.setstate((version, tuple(internal), gauss))
+    game.deck = [card_from_code(code) for code in data["deck"]]
+    game.discard_pile = [card_from_code(code) for code in data["discard_pile"]]
+    game.hand = [card_from_code(code) for code in data["hand"]]
+    for i in data["selected"]:
+        game.hand[i].selected = True
+    game.jokers = []
+    for type_index, used in data["jokers"]:
+        joker = Joker(JOKER_TYPES[type_index])
+        joker.used = used
+        game.jokers.append(joker)
+    game.shop_jokers = [Joker(JOKER_TYPES[type_index]) for type_index in data["shop_jokers"]]
+    return game
+
+
+def client_state(game):
+    """What a client needs to draw the game, kept small since it goes over the wire"""
+    return {
+        "phase": game.phase,
+        "over": not game.running,
+        "hand": [card.get_code() for card in game.hand],
+        "selected": [i for i, card in enumerate(game.hand) if card.selected],
+        "jokers": [JOKER_TYPES.index(joker.type) for joker in game.jokers],
+        "shop": [JOKER_TYPES.index(joker.type) for joker in game.shop_jokers],
+        "money": game.money,
+        "score": game.current_score,
+        "target": game.target_score,
+        "hands": game.hands_remaining,
+        "discards": game.discards_remaining,
+        "ante": game.ante,
+        "round": game.ante_round,
+        "preview": [game.preview_chips, game.preview_mult, game.preview_score],
+        "deck": len(game.deck),
+    }
+
+
+def state_diff(old, new):
+    return {key: value for key, value in new.items() if old.get(key) != value}
+
+
+class Session:
+    def __init__(self, game):
+        self.game = game
+        self.last_state = client_state(game)
+        self.last_used = time.monotonic()
+
+
+class GameServer:
+    """Hosts many headless games in one process behind a line-delimited JSON protocol.
+
+    Requests are one JSON object per line:
+        {"action": "new", "seed": 42}
+        {"session": "...", "action": "select", "index": 3}
+        {"session": "...", "action": "play"}   (also discard, buy, sell, skip, next,
+                                                sort_rank, sort_suit, state, close)
+    Replies carry "ok" and a "diff" with only the state keys that changed since
+    the session's previous reply ("state" and "new" return the full state).
+    An "id" in the request is echoed back. Sessions idle for longer than
+    idle_timeout are swapped out to a zlib-compressed snapshot and transparently
+    restored on their next request. Snapshots nobody comes back for within
+    session_ttl seconds are dropped, like a closed session.
+    """
+
+    def __init__(self, idle_timeout=300.0, sweep_interval=30.0, session_ttl=86400.0):
+        self.sessions = {}
+        self.evicted = {}  # session id -> (time evicted, compressed snapshot)
+        self.idle_timeout = idle_timeout
+        self.session_ttl = session_ttl
+        self.sweep_interval = sweep_interval
+
+    def create_session(self, seed=None):
+        session_id = secrets.token_hex(8)
+        self.sessions[session_id] = Session(Game(seed=seed, headless=True))
+        return session_id
+
+    def get_session(self, session_id):
+        session = self.sessions.get(session_id)
+        if session is None and session_id in self.evicted:
+            data = json.loads(zlib.decompress(self.evicted.pop(session_id)[1]))
+            session = self.sessions[session_id] = Session(restore_game(data))
+        if session is not None:
+            session.last_used = time.monotonic()
+        return session
+
+    def evict_idle(self):
+        now = time.monotonic()
+        cutoff = now - self.idle_timeout
+        for session_id in [sid for sid, s in self.sessions.items() if s.last_used < cutoff]:
+            data = json.dumps(snapshot_game(self.sessions.pop(session_id).game), separators=(",", ":"))
+            self.evicted[session_id] = (now, zlib.compress(data.encode(), 6))
+        # Abandoned sessions, players rarely send close
+        expired = now - self.session_ttl
+        for session_id in [sid for sid, (evicted_at, _) in self.evicted.items() if evicted_at < expired]:
+            del self.evicted[session_id]
+
+    def handle_request(self, request):
+        action = request.get("action")
+        if action == "new":
+            seed = request.get("seed")
+            if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+                raise ValueError("seed must be an integer")
+            session_id = self.create_session(seed)
+            session = self.sessions[session_id]
+            return {"session": session_id, "ok": True, "state": session.last_state}
+
+        session_id = request.get("session")
+        if session_id is not None and not isinstance(session_id, str):
+            raise ValueError("session must be a string")
+        session = self.get_session(session_id)
+        if session is None:
+            return {"session": session_id, "ok": False, "error": "unknown session"}
+        if action == "close":
+            del self.sessions[session_id]
+            return {"session": session_id, "ok": True}
+        if action == "state":
+            session.last_state = client_state(session.game)
+            return {"session": session_id, "ok": True, "state": session.last_state}
+
+        try:
+            ok = session.game.running and session.game.apply_action(action, request.get("index"))
+        except (ValueError, TypeError) as e:
+            return {"session": session_id, "ok": False, "error": str(e)}
+        state = client_state(session.game)
+        diff = state_diff(session.last_state, state)
+        session.last_state = state
+        return {"session": session_id, "ok": bool(ok), "diff": diff}
+
+    async def handle_client(self, reader, writer):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                    if not isinstance(request, dict):
+                        raise ValueError("request must be a JSON object")
+                    reply = self.handle_request(request)
+                    if "id" in request:
+                        reply["id"] = request["id"]
+                except ValueError as e:
+                    reply = {"ok": False, "error": f"bad request: {e}"}
+                writer.write(json.dumps(reply, separators=(",", ":")).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def sweep_forever(self):
+        while True:
+            await asyncio.sleep(self.sweep_interval)
+            self.evict_idle()
+
+    async def serve(self, host="127.0.0.1", port=8765, unix_path=None):
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            server = await asyncio.start_unix_server(self.handle_client, unix_path)
+        else:
+            server = await asyncio.start_server(self.handle_client, host, port)
+        sweeper = asyncio.ensure_future(self.sweep_forever())
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            sweeper.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-session Balatro-like game server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="Listen on a Unix socket instead of TCP")
+    parser.add_argument("--idle-timeout", type=float, default=300.0,
+                        help="Seconds before an idle session is swapped out")
+    parser.add_argument("--session-ttl", type=float, default=86400.0,
+                        help="Seconds a swapped out session is kept before it's dropped")
+    args = parser.parse_args()
+
+    server = GameServer(idle_timeout=args.idle_timeout, session_ttl=args.session_ttl)
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
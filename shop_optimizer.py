@@ -0,0 +1,93 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+
+class Recommendation:
+    def __init__(self, sell, buy, value, money):
+        self.sell = sell  # Indices into the owned jokers, sell these first
+        self.buy = buy  # Indices into the shop
+        self.value = value  # Expected future score of following the advice
+        self.money = money  # Money left afterwards
+
+    def __repr__(self):
+        return f"Recommendation(sell={self.sell}, buy={self.buy}, value={self.value:.0f}, money={self.money})"
+
+
+class ShopOptimizer:
+    """Picks the sell/buy set that maximises expected future score.
+
+    It's a DP over (item, money, loadout): owned jokers are kept or sold (for
+    half their cost), then shop jokers are skipped or bought while there's
+    money and a free slot. A finished loadout is worth hands_left times its
+    expected score per hand. Money left over is worth what it could buy later,
+    interest included, at `money_discount` of today's average joker value.
+
+    Knows nothing about the game itself: jokers are plain sortable keys,
+    hand_value(sorted tuple of keys) estimates the score of one hand, catalog
+    maps every key to its cost, interest(money) is the interest earned on it.
+    Loadout values are memoized across calls, whole answers in a small LRU.
+    """
+
+    def __init__(self, hand_value, catalog, interest, max_jokers, money_discount=0.5, cache_size=100000):
+        self.hand_value = hand_value
+        self.interest = interest
+        self.max_jokers = max_jokers
+        self.values = {}
+        self.answers = OrderedDict()
+        self.cache_size = cache_size
+
+        base = self.loadout_value(())
+        gains = [(self.loadout_value((key,)) - base) / cost for key, cost in catalog.items() if cost > 0]
+        self.score_per_dollar = money_discount * max(0.0, sum(gains) / len(gains)) if gains else 0.0
+
+    def loadout_value(self, loadout):
+        value = self.values.get(loadout)
+        if value is None:
+            value = self.values[loadout] = self.hand_value(loadout)
+        return value
+
+    def recommend(self, money, owned, shop, hands_left, allow_sell=True):
+        """owned and shop are lists of (key, cost), returns a Recommendation"""
+        cache_key = (money, tuple(owned), tuple(shop), hands_left, allow_sell)
+        answer = self.answers.get(cache_key)
+        if answer is not None:
+            self.answers.move_to_end(cache_key)
+            return answer
+
+        items = [("sell", i, key, cost) for i, (key, cost) in enumerate(owned) if allow_sell]
+        items += [("buy", i, key, cost) for i, (key, cost) in enumerate(shop)]
+        dollar_value = hands_left * self.score_per_dollar
+
+        @lru_cache(maxsize=None)
+        def best(item, money, loadout):
+            """Best (value, choices, money) from item onwards, loadout is a sorted tuple"""
+            if item == len(items):
+                value = hands_left * self.loadout_value(loadout)
+                value += dollar_value * (money + self.interest(money))
+                return value, (), money
+            kind, index, key, cost = items[item]
+            # Keep the owned joker / leave the shop joker
+            result = best(item + 1, money, loadout)
+            if kind == "sell":
+                position = loadout.index(key)
+                value, choices, left = best(item + 1, money + cost // 2,
+                                            loadout[:position] + loadout[position + 1:])
+                if value > result[0]:
+                    result = (value, (item,) + choices, left)
+            elif money >= cost and len(loadout) < self.max_jokers:
+                value, choices, left = best(item + 1, money - cost, tuple(sorted(loadout + (key,))))
+                if value > result[0]:
+                    result = (value, (item,) + choices, left)
+            return result
+
+        value, choices, left = best(0, money, tuple(sorted(key for key, _ in owned)))
+        answer = Recommendation(
+            sell=[items[i][1] for i in choices if items[i][0] == "sell"],
+            buy=[items[i][1] for i in choices if items[i][0] == "buy"],
+            value=value,
+            money=left,
+        )
+        self.answers[cache_key] = answer
+        if len(self.answers) > self.cache_size:
+            self.answers.popitem(last=False)
+        return answer
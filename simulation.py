@@ -0,0 +1,384 @@
+import argparse
+import json
+import multiprocessing
+import os
+import signal
+import tempfile
+import time
+from itertools import combinations
+
+from Main import DeckSpec, Game, HandType, JokerType, evaluate_hand, score_hand
+from stats import SimulationStats
+from tables import get_hand_table
+from telemetry import TelemetrySink
+
+CHECKPOINT_VERSION = 2
+
+
+class GreedyStrategy:
+    """Reference strategy: play the best scoring subset, discard when it can't win"""
+
+    name = "greedy"
+
+    def best_play(self, game):
+        if not game.deck_spec.is_standard():
+            return self.best_play_counts(game)
+        table = get_hand_table()
+        best_cards, best_score = [], -1
+        # Sorting by code once means every combination comes out sorted for the table
+        hand = sorted(game.hand, key=lambda card: card.get_code())
+        codes = [card.get_code() for card in hand]
+        for size in range(1, min(game.max_selected, len(hand)) + 1):
+            for indices in combinations(range(len(hand)), size):
+                _, chips, mult = table.score_codes([codes[i] for i in indices], game.jokers)
+                score = int(chips * mult)
+                if score > best_score:
+                    best_cards, best_score = [hand[i] for i in indices], score
+        return best_cards, best_score
+
+    def best_play_counts(self, game):
+        # The table only covers one standard deck, custom decks are scored directly
+        best_cards, best_score = [], -1
+        for size in range(1, min(game.max_selected, len(game.hand)) + 1):
+            for cards in combinations(game.hand, size):
+                _, chips, mult = score_hand(cards, game.jokers)
+                score = int(chips * mult)
+                if score > best_score:
+                    best_cards, best_score = list(cards), score
+        return best_cards, best_score
+
+    def choose_cards(self, game):
+        """Return ("play" | "discard", cards) for the current hand"""
+        cards, score = self.best_play(game)
+        needed = game.target_score - game.current_score
+        if score * game.hands_remaining < needed and game.discards_remaining > 0 and game.deck:
+            # Throw away the lowest cards that aren't part of the best hand
+            keep = set(id(c) for c in cards)
+            spare = sorted((c for c in game.hand if id(c) not in keep), key=lambda c: c.value)
+            if spare:
+                return "discard", spare[:game.max_selected]
+        return "play", cards
+
+    def shop(self, game):
+        # Buy the most expensive joker we can afford until money or slots run out
+        while True:
+            affordable = [i for i, joker in enumerate(game.shop_jokers)
+                          if joker.cost <= game.money]
+            if not affordable or len(game.jokers) >= game.max_jokers:
+                return
+            game.buy_joker(max(affordable, key=lambda i: game.shop_jokers[i].cost))
+
+
+class OptimizerStrategy(GreedyStrategy):
+    """Greedy play, but follows the shop optimizer's buy/sell advice"""
+
+    name = "optimizer"
+
+    def shop(self, game):
+        advice = game.get_shop_advice()
+        # Highest index first so earlier indices stay valid
+        for index in sorted(advice.sell, reverse=True):
+            game.apply_action("sell", index)
+        for index in sorted(advice.buy, reverse=True):
+            game.apply_action("buy", index)
+
+
+STRATEGIES = {strategy.name: strategy for strategy in (GreedyStrategy, OptimizerStrategy)}
+
+
+def simulate_run(seed, strategy=None, max_rounds=None, stats=None, telemetry=None, difficulty=None, deck_spec=None):
+    """Play one seeded game headlessly and return a summary dict.
+
+    If stats (a SimulationStats) is given, hands, round scores, shop picks and
+    money are recorded into it as the game goes. A TelemetrySink gets every
+    played hand. difficulty can override base_target, ante_growth and
+    round_growth, deck_spec changes the deck (a DeckSpec).
+    """
+    strategy = strategy or GreedyStrategy()
+    game = Game(seed=seed, headless=True, deck_spec=deck_spec)
+    if difficulty:
+        for name, value in difficulty.items():
+            setattr(game, name, value)
+        game.target_score = game.calculate_target_score()
+    if telemetry:
+        game.set_telemetry(telemetry)
+    hands_played = 0
+    while game.running:
+        if max_rounds is not None and game.round > max_rounds:
+            break
+        if game.phase == "shop":
+            owned = set(id(joker) for joker in game.jokers)
+            offered = [joker.type.value[0] for joker in game.shop_jokers]
+            strategy.shop(game)
+            if stats is not None:
+                picked = [joker.type.value[0] for joker in game.jokers if id(joker) not in owned]
+                stats.record_shop(offered, picked)
+            game.next_round()
+            continue
+
+        action, cards = strategy.choose_cards(game)
+        for card in cards:
+            card.selected = True
+        if action == "discard":
+            game.discard_selected_cards()
+            game.sort_cards()
+            continue
+
+        hand_type = evaluate_hand(cards)
+        ante, ante_round, round_number = game.ante, game.ante_round, game.round
+        score_before, money_before = game.current_score, game.money
+        interest = game.calculate_interest()
+        if not game.play_hand():
+            break  # Nothing left to play
+        hands_played += 1
+
+        if stats is not None:
+            stats.record_hand(hand_type.label, game.current_score - score_before)
+            if game.phase == "shop" or not game.running:
+                stats.record_round_end(ante, ante_round, game.current_score)
+            if game.phase == "shop":
+                stats.record_money(round_number, game.money, game.money - money_before, interest)
+
+    result = {
+        "seed": seed,
+        "won": game.ante > 8,
+        "ante": min(game.ante, 8),
+        "round": game.round,
+        "score": game.current_score,
+        "money": game.money,
+        "jokers": len(game.jokers),
+        "hands_played": hands_played,
+    }
+    if stats is not None:
+        stats.record_run(result)
+    return result
+
+
+def run_shard(task):
+    """Worker entry point, simulates seeds [start, stop) and returns (shard_id, stats dict)"""
+    shard_id, start, stop, strategy_name, telemetry_dir = task
+    strategy = STRATEGIES[strategy_name]()
+    stats = SimulationStats()
+    telemetry = None
+    if telemetry_dir:
+        # One chunk directory per shard, a re-run shard simply overwrites its own
+        telemetry = TelemetrySink(os.path.join(telemetry_dir, f"shard-{shard_id:06d}"), HandType, JokerType)
+    try:
+        for seed in range(start, stop):
+            simulate_run(seed, strategy, stats=stats, telemetry=telemetry)
+    finally:
+        if telemetry:
+            telemetry.close()
+    return shard_id, stats.to_dict()
+
+
+def write_json_atomic(path, data):
+    """Write JSON next to the target and rename it over, so a crash never leaves half a file"""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=".checkpoint-", dir=directory)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, separators=(",", ":"))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def load_checkpoint(path):
+    with open(path) as f:
+        data = json.load(f)
+    if data.get("version") != CHECKPOINT_VERSION:
+        raise ValueError(f"{path}: unsupported checkpoint version {data.get('version')}")
+    return data
+
+
+class Campaign:
+    """Simulate a seed range in shards on a process pool, checkpointing as it goes.
+
+    The checkpoint holds the campaign parameters, the IDs of finished shards and
+    the merged SimulationStats for them, so its size doesn't grow with the run
+    count. Re-running with the same checkpoint skips finished shards, and
+    checkpoints of disjoint shard sets (e.g. one per machine) can be merged.
+    """
+
+    def __init__(self, checkpoint_path, start=0, stop=10000, shard_size=1000,
+                 strategy="greedy", workers=None, checkpoint_interval=30.0,
+                 machine=0, machines=1, telemetry_dir=None):
+        self.checkpoint_path = checkpoint_path
+        self.params = {
+            "start": start,
+            "stop": stop,
+            "shard_size": shard_size,
+            "strategy": strategy,
+        }
+        self.workers = workers or os.cpu_count()
+        self.checkpoint_interval = checkpoint_interval
+        self.machine = machine
+        self.machines = machines
+        self.telemetry_dir = telemetry_dir
+        self.completed = set()
+        self.stats = SimulationStats()
+        if os.path.exists(checkpoint_path):
+            checkpoint = load_checkpoint(checkpoint_path)
+            if checkpoint["params"] != self.params:
+                raise ValueError(f"{checkpoint_path} belongs to a different campaign: "
+                                 f"{checkpoint['params']}")
+            self.completed = set(checkpoint["completed"])
+            self.stats = SimulationStats.from_dict(checkpoint["stats"])
+
+    def shard_count(self):
+        span = self.params["stop"] - self.params["start"]
+        return (span + self.params["shard_size"] - 1) // self.params["shard_size"]
+
+    def pending_tasks(self):
+        start, stop, size = self.params["start"], self.params["stop"], self.params["shard_size"]
+        tasks = []
+        for shard_id in range(self.shard_count()):
+            if shard_id % self.machines != self.machine or shard_id in self.completed:
+                continue
+            shard_start = start + shard_id * size
+            tasks.append((shard_id, shard_start, min(shard_start + size, stop), self.params["strategy"],
+                          self.telemetry_dir))
+        return tasks
+
+    def save(self):
+        write_json_atomic(self.checkpoint_path, {
+            "version": CHECKPOINT_VERSION,
+            "params": self.params,
+            "completed": sorted(self.completed),
+            "stats": self.stats.to_dict(),
+        })
+
+    def run(self):
+        tasks = self.pending_tasks()
+        if not tasks:
+            return self.stats
+        # Build the hand table here if needed, the workers then just map the file
+        get_hand_table()
+
+        # Spot instances get SIGTERM before they go away, treat it like Ctrl+C
+        previous_handler = signal.signal(signal.SIGTERM, _raise_interrupt)
+        last_save = time.monotonic()
+        try:
+            with multiprocessing.Pool(self.workers, initializer=_ignore_interrupts) as pool:
+                for shard_id, shard_stats in pool.imap_unordered(run_shard, tasks):
+                    self.stats.merge(SimulationStats.from_dict(shard_stats))
+                    self.completed.add(shard_id)
+                    if time.monotonic() - last_save >= self.checkpoint_interval:
+                        self.save()
+                        last_save = time.monotonic()
+        finally:
+            self.save()
+            signal.signal(signal.SIGTERM, previous_handler)
+        return self.stats
+
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt
+
+
+def _ignore_interrupts():
+    # Only the parent should react to Ctrl+C / SIGTERM, it saves and tears the pool down
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+
+
+def merge_checkpoints(paths, output_path):
+    """Merge checkpoints of the same campaign, e.g. copied from several machines"""
+    merged = None
+    for path in paths:
+        checkpoint = load_checkpoint(path)
+        if merged is None:
+            merged = {"version": CHECKPOINT_VERSION, "params": checkpoint["params"], "completed": [],
+                      "stats": SimulationStats()}
+        elif checkpoint["params"] != merged["params"]:
+            raise ValueError(f"{path} belongs to a different campaign: {checkpoint['params']}")
+        # Stats are already aggregated, so a shard counted twice can't be taken back out
+        overlap = set(merged["completed"]) & set(checkpoint["completed"])
+        if overlap:
+            raise ValueError(f"{path} repeats shards {sorted(overlap)[:10]}, use --machine/--machines "
+                             f"to split campaigns across machines")
+        merged["completed"].extend(checkpoint["completed"])
+        merged["stats"].merge(SimulationStats.from_dict(checkpoint["stats"]))
+    if merged is None:
+        raise ValueError("No checkpoints to merge")
+    merged["completed"].sort()
+    stats = merged["stats"]
+    merged["stats"] = stats.to_dict()
+    write_json_atomic(output_path, merged)
+    return len(merged["completed"]), stats
+
+
+def print_summary(stats, done, total_shards=None):
+    print(f"Shards: {done}" + (f"/{total_shards}" if total_shards else ""))
+    if not stats.runs:
+        return
+    print(f"Runs: {stats.runs}  Win rate: {stats.wins / stats.runs:.2%}  "
+          f"Avg rounds: {stats.rounds_reached.mean:.2f} (sd {stats.rounds_reached.stddev:.2f})")
+    for ante in sorted(stats.ante_reached):
+        print(f"  Ante {ante}: {stats.ante_reached[ante]}")
+    print("Hands played:")
+    for label, count in stats.hand_types.most_common():
+        print(f"  {label}: {count}")
+    print("Joker pick rates:")
+    for label, rate in sorted(stats.joker_pick_rates().items(), key=lambda item: -item[1]):
+        print(f"  {label}: {rate:.1%}")
+    print("Round scores (mean / median):")
+    for key in sorted(stats.round_scores):
+        median = stats.round_score_histograms[key].quantile(0.5)
+        print(f"  Ante {key[0]} round {key[1]}: {stats.round_scores[key].mean:.0f} / ~{median:.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Balatro-like simulations")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Simulate a single seed")
+    run_parser.add_argument("seed", type=int)
+    run_parser.add_argument("--decks", type=int, default=1)
+    run_parser.add_argument("--remove-ranks", default="", metavar="RANKS", help='e.g. "2,3"')
+    run_parser.add_argument("--extra-suits", default="", metavar="SUITS", help='e.g. "stars,moons"')
+
+    campaign_parser = subparsers.add_parser("campaign", help="Run or resume a checkpointed seed range")
+    campaign_parser.add_argument("checkpoint")
+    campaign_parser.add_argument("--start", type=int, default=0)
+    campaign_parser.add_argument("--stop", type=int, default=10000)
+    campaign_parser.add_argument("--shard-size", type=int, default=1000)
+    campaign_parser.add_argument("--strategy", choices=sorted(STRATEGIES), default="greedy")
+    campaign_parser.add_argument("--workers", type=int, default=None)
+    campaign_parser.add_argument("--checkpoint-interval", type=float, default=30.0,
+                                 help="Seconds between checkpoint writes")
+    campaign_parser.add_argument("--machine", type=int, default=0,
+                                 help="Index of this machine when splitting shards across machines")
+    campaign_parser.add_argument("--machines", type=int, default=1)
+    campaign_parser.add_argument("--telemetry", metavar="DIR", default=None,
+                                 help="Write per-hand telemetry, one subdirectory per shard")
+
+    merge_parser = subparsers.add_parser("merge", help="Merge checkpoints from several machines")
+    merge_parser.add_argument("output")
+    merge_parser.add_argument("checkpoints", nargs="+")
+
+    args = parser.parse_args()
+    if args.command == "run":
+        deck_spec = DeckSpec.from_args(args.decks, args.remove_ranks, args.extra_suits)
+        print(json.dumps(simulate_run(args.seed, deck_spec=deck_spec)))
+    elif args.command == "campaign":
+        campaign = Campaign(args.checkpoint, args.start, args.stop, args.shard_size,
+                            args.strategy, args.workers, args.checkpoint_interval,
+                            args.machine, args.machines, args.telemetry)
+        try:
+            campaign.run()
+        except KeyboardInterrupt:
+            print("Interrupted, progress saved to", args.checkpoint)
+        print_summary(campaign.stats, len(campaign.completed), campaign.shard_count())
+    elif args.command == "merge":
+        done, stats = merge_checkpoints(args.checkpoints, args.output)
+        print_summary(stats, done)
+
+
+if __name__ == "__main__":
+    main()
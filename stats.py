@@ -0,0 +1,249 @@
+import math
+from collections import Counter
+
+
+class RunningStats:
+    """Online mean/variance (Welford), mergeable across workers"""
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+
+    def add(self, value):
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def merge(self, other):
+        if not other.count:
+            return self
+        if not self.count:
+            self.count, self.mean, self.m2 = other.count, other.mean, other.m2
+            self.min, self.max = other.min, other.max
+            return self
+        # Chan et al. parallel combination
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.m2 += other.m2 + delta * delta * self.count * other.count / count
+        self.count = count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        return self
+
+    @property
+    def variance(self):
+        return self.m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stddev(self):
+        return math.sqrt(self.variance)
+
+    def to_dict(self):
+        if not self.count:
+            return {"count": 0}
+        return {"count": self.count, "mean": self.mean, "m2": self.m2, "min": self.min, "max": self.max}
+
+    @staticmethod
+    def from_dict(data):
+        stats = RunningStats()
+        if data["count"]:
+            stats.count = data["count"]
+            stats.mean = data["mean"]
+            stats.m2 = data["m2"]
+            stats.min = data["min"]
+            stats.max = data["max"]
+        return stats
+
+
+class LogHistogram:
+    """Fixed-bin histogram on a log scale, scores span several orders of magnitude.
+
+    Bin 0 holds values below 1, the last bin everything above max_value.
+    """
+
+    def __init__(self, max_value=1e9, bins_per_decade=20):
+        self.bins_per_decade = bins_per_decade
+        self.bin_count = int(math.log10(max_value) * bins_per_decade) + 2
+        self.counts = [0] * self.bin_count
+
+    def bin_index(self, value):
+        if value < 1:
+            return 0
+        return min(int(math.log10(value) * self.bins_per_decade) + 1, self.bin_count - 1)
+
+    def bin_lower_edge(self, index):
+        return 0.0 if index == 0 else 10 ** ((index - 1) / self.bins_per_decade)
+
+    def add(self, value):
+        self.counts[self.bin_index(value)] += 1
+
+    def merge(self, other):
+        if other.bin_count != self.bin_count or other.bins_per_decade != self.bins_per_decade:
+            raise ValueError("Can't merge histograms with different bins")
+        for i, count in enumerate(other.counts):
+            self.counts[i] += count
+        return self
+
+    def quantile(self, q):
+        """Approximate quantile, accurate to one bin width"""
+        total = sum(self.counts)
+        if not total:
+            return 0.0
+        seen = 0
+        for i, count in enumerate(self.counts):
+            seen += count
+            if seen >= q * total:
+                return self.bin_lower_edge(i)
+        return self.bin_lower_edge(self.bin_count - 1)
+
+    def to_dict(self):
+        # Sparse, most bins stay empty
+        return {
+            "bins_per_decade": self.bins_per_decade,
+            "bin_count": self.bin_count,
+            "counts": {str(i): c for i, c in enumerate(self.counts) if c},
+        }
+
+    @staticmethod
+    def from_dict(data):
+        histogram = LogHistogram(bins_per_decade=data["bins_per_decade"])
+        histogram.bin_count = data["bin_count"]
+        histogram.counts = [0] * histogram.bin_count
+        for i, count in data["counts"].items():
+            histogram.counts[int(i)] = count
+        return histogram
+
+
+class SimulationStats:
+    """Everything we track over a simulation sweep in memory that doesn't grow with run count.
+
+    Keys are bounded by the game itself: 8 antes x 3 rounds, the HandType and
+    JokerType members, and at most 24 rounds for the money curve.
+    """
+
+    def __init__(self):
+        self.runs = 0
+        self.wins = 0
+        self.rounds_reached = RunningStats()
+        self.ante_reached = Counter()
+        self.hands_played = RunningStats()
+        # (ante, ante_round) -> score at the end of that round
+        self.round_scores = {}
+        self.round_score_histograms = {}
+        self.hand_types = Counter()
+        self.hand_scores = RunningStats()
+        self.joker_offers = Counter()
+        self.joker_picks = Counter()
+        # Round number -> money after the round's reward / that round's reward and interest
+        self.money_curve = {}
+        self.rewards = {}
+        self.interest = {}
+
+    def record_hand(self, hand_type_label, score):
+        self.hand_types[hand_type_label] += 1
+        self.hand_scores.add(score)
+
+    def record_round_end(self, ante, ante_round, score):
+        key = (ante, ante_round)
+        if key not in self.round_scores:
+            self.round_scores[key] = RunningStats()
+            self.round_score_histograms[key] = LogHistogram()
+        self.round_scores[key].add(score)
+        self.round_score_histograms[key].add(score)
+
+    def record_money(self, round_number, money, reward, interest):
+        for table, value in ((self.money_curve, money), (self.rewards, reward), (self.interest, interest)):
+            table.setdefault(round_number, RunningStats()).add(value)
+
+    def record_shop(self, offered_labels, picked_labels):
+        self.joker_offers.update(offered_labels)
+        self.joker_picks.update(picked_labels)
+
+    def record_run(self, result):
+        self.runs += 1
+        self.wins += int(result["won"])
+        self.rounds_reached.add(result["round"])
+        self.ante_reached[result["ante"]] += 1
+        self.hands_played.add(result["hands_played"])
+
+    def joker_pick_rates(self):
+        return {label: self.joker_picks[label] / offers for label, offers in self.joker_offers.items()}
+
+    def merge(self, other):
+        self.runs += other.runs
+        self.wins += other.wins
+        self.rounds_reached.merge(other.rounds_reached)
+        self.ante_reached.update(other.ante_reached)
+        self.hands_played.merge(other.hands_played)
+        for key, stats in other.round_scores.items():
+            if key in self.round_scores:
+                self.round_scores[key].merge(stats)
+                self.round_score_histograms[key].merge(other.round_score_histograms[key])
+            else:
+                self.round_scores[key] = RunningStats().merge(stats)
+                self.round_score_histograms[key] = LogHistogram().merge(other.round_score_histograms[key])
+        self.hand_types.update(other.hand_types)
+        self.hand_scores.merge(other.hand_scores)
+        self.joker_offers.update(other.joker_offers)
+        self.joker_picks.update(other.joker_picks)
+        for mine, theirs in ((self.money_curve, other.money_curve), (self.rewards, other.rewards),
+                             (self.interest, other.interest)):
+            for round_number, stats in theirs.items():
+                mine.setdefault(round_number, RunningStats()).merge(stats)
+        return self
+
+    def to_dict(self):
+        def per_round(table):
+            return {str(k): v.to_dict() for k, v in table.items()}
+
+        return {
+            "runs": self.runs,
+            "wins": self.wins,
+            "rounds_reached": self.rounds_reached.to_dict(),
+            "ante_reached": {str(k): v for k, v in self.ante_reached.items()},
+            "hands_played": self.hands_played.to_dict(),
+            "round_scores": {f"{a}-{r}": s.to_dict() for (a, r), s in self.round_scores.items()},
+            "round_score_histograms": {f"{a}-{r}": h.to_dict()
+                                       for (a, r), h in self.round_score_histograms.items()},
+            "hand_types": dict(self.hand_types),
+            "hand_scores": self.hand_scores.to_dict(),
+            "joker_offers": dict(self.joker_offers),
+            "joker_picks": dict(self.joker_picks),
+            "money_curve": per_round(self.money_curve),
+            "rewards": per_round(self.rewards),
+            "interest": per_round(self.interest),
+        }
+
+    @staticmethod
+    def from_dict(data):
+        def round_key(key):
+            ante, ante_round = key.split("-")
+            return int(ante), int(ante_round)
+
+        def per_round(table):
+            return {int(k): RunningStats.from_dict(v) for k, v in table.items()}
+
+        stats = SimulationStats()
+        stats.runs = data["runs"]
+        stats.wins = data["wins"]
+        stats.rounds_reached = RunningStats.from_dict(data["rounds_reached"])
+        stats.ante_reached = Counter({int(k): v for k, v in data["ante_reached"].items()})
+        stats.hands_played = RunningStats.from_dict(data["hands_played"])
+        stats.round_scores = {round_key(k): RunningStats.from_dict(v) for k, v in data["round_scores"].items()}
+        stats.round_score_histograms = {round_key(k): LogHistogram.from_dict(v)
+                                        for k, v in data["round_score_histograms"].items()}
+        stats.hand_types = Counter(data["hand_types"])
+        stats.hand_scores = RunningStats.from_dict(data["hand_scores"])
+        stats.joker_offers = Counter(data["joker_offers"])
+        stats.joker_picks = Counter(data["joker_picks"])
+        stats.money_curve = per_round(data["money_curve"])
+        stats.rewards = per_round(data["rewards"])
+        stats.interest = per_round(data["interest"])
+        return stats
@@ -0,0 +1,173 @@
+import hashlib
+import inspect
+import mmap
+import os
+import struct
+import tempfile
+import time
+from itertools import combinations
+from math import comb
+
+from Main import (RANKS, STANDARD_SUITS, HandType, apply_jokers, card_from_code,
+                  count_cards, evaluate_counts)
+
+TABLE_VERSION = 1
+MAGIC = b"BLTRHAND"
+# magic, version, entry size, entry count, fingerprint
+HEADER = struct.Struct("<8sIIQ32s")
+ENTRY_SIZE = 3  # hand type index, scoring card chips, scoring card count
+DECK_SIZE = len(STANDARD_SUITS) * len(RANKS)  # One standard deck, see DeckSpec.is_standard
+MAX_CARDS = 5
+
+DEFAULT_PATH = os.environ.get(
+    "BALATRO_TABLE_PATH",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", f"hand_table.v{TABLE_VERSION}.bin"))
+
+HAND_TYPES = list(HandType)
+
+# BINOMIAL[n][k] for the combinatorial number system index
+BINOMIAL = [[comb(n, k) for k in range(MAX_CARDS + 1)] for n in range(DECK_SIZE + 1)]
+# Subsets of each size are stored one after the other, smallest first
+SIZE_OFFSETS = [0, 0]
+for _size in range(2, MAX_CARDS + 1):
+    SIZE_OFFSETS.append(SIZE_OFFSETS[-1] + comb(DECK_SIZE, _size - 1))
+ENTRY_COUNT = SIZE_OFFSETS[MAX_CARDS] + comb(DECK_SIZE, MAX_CARDS)
+
+
+def fingerprint():
+    """Hash of everything the table's contents depend on, a mismatch means the file is stale"""
+    h = hashlib.sha256()
+    h.update(f"v{TABLE_VERSION}".encode())
+    for hand_type in HandType:
+        h.update(f"{hand_type.name}:{hand_type.label}:{hand_type.chips}:{hand_type.mult};".encode())
+    h.update(repr(RANKS).encode())
+    h.update(repr([suit.value for suit in STANDARD_SUITS]).encode())
+    h.update(repr([card_from_code(code).value for code in range(DECK_SIZE)]).encode())
+    for function in (count_cards, evaluate_counts):
+        try:
+            h.update(inspect.getsource(function).encode())
+        except OSError:
+            h.update(function.__qualname__.encode())
+    return h.digest()
+
+
+def subset_index(codes):
+    """Table index of a set of 1-5 distinct card codes, codes must be sorted ascending"""
+    index = SIZE_OFFSETS[len(codes)]
+    for i, code in enumerate(codes, 1):
+        index += BINOMIAL[code][i]
+    return index
+
+
+def build_table():
+    """Evaluate every 1-5 card subset of the deck, takes a few seconds"""
+    data = bytearray(ENTRY_COUNT * ENTRY_SIZE)
+    cards = [card_from_code(code) for code in range(DECK_SIZE)]
+    values = [card.value for card in cards]
+    suits = [code // len(RANKS) for code in range(DECK_SIZE)]
+    # Hand type and chips only depend on the values and whether it's a flush
+    memo = {}
+    for size in range(1, MAX_CARDS + 1):
+        for codes in combinations(range(DECK_SIZE), size):
+            key = (tuple(sorted(values[c] for c in codes)),
+                   size == 5 and len(set(suits[c] for c in codes)) == 1)
+            entry = memo.get(key)
+            if entry is None:
+                hand_type, chips, count = evaluate_counts(*count_cards([cards[c] for c in codes]))
+                entry = memo[key] = bytes((HAND_TYPES.index(hand_type), chips, count))
+            offset = subset_index(codes) * ENTRY_SIZE
+            data[offset:offset + ENTRY_SIZE] = entry
+    return data
+
+
+def write_table(path, data):
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Build under a temporary name so concurrent workers never see half a file
+    fd, tmp_path = tempfile.mkstemp(prefix=".hand_table-", dir=directory)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(HEADER.pack(MAGIC, TABLE_VERSION, ENTRY_SIZE, ENTRY_COUNT, fingerprint()))
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class HandTable:
+    """Read-only, memory-mapped lookup of hand type and card chips for any 1-5 card subset.
+
+    All processes that open the same file share its pages, so pool workers
+    don't pay for building or copying the table.
+    """
+
+    def __init__(self, path=DEFAULT_PATH, rebuild=True):
+        self.path = path
+        self.file = None
+        if not self.open() and rebuild:
+            write_table(path, build_table())
+            if not self.open():
+                raise RuntimeError(f"Could not load hand table from {path}")
+
+    def open(self):
+        """Map the file if it is current, returns False if it's missing or stale"""
+        try:
+            f = open(self.path, "rb")
+        except FileNotFoundError:
+            return False
+        expected_size = HEADER.size + ENTRY_COUNT * ENTRY_SIZE
+        if os.fstat(f.fileno()).st_size != expected_size:
+            f.close()
+            return False
+        header = HEADER.unpack(f.read(HEADER.size))
+        if header != (MAGIC, TABLE_VERSION, ENTRY_SIZE, ENTRY_COUNT, fingerprint()):
+            f.close()
+            return False
+        self.file = f
+        self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self.data = memoryview(self.map)[HEADER.size:]
+        return True
+
+    def lookup_codes(self, codes):
+        """Return (hand_type, card_chips, scoring_count) for sorted, distinct card codes"""
+        offset = subset_index(codes) * ENTRY_SIZE
+        data = self.data
+        return HAND_TYPES[data[offset]], data[offset + 1], data[offset + 2]
+
+    def score_codes(self, codes, jokers):
+        """Same (hand_type, chips, mult) as Main.score_hand"""
+        hand_type, card_chips, scoring_count = self.lookup_codes(codes)
+        chips, mult = apply_jokers(jokers, hand_type, card_chips, scoring_count)
+        return hand_type, chips, mult
+
+    def close(self):
+        if self.file:
+            self.data.release()
+            self.map.close()
+            self.file.close()
+            self.file = None
+
+
+_table = None
+
+
+def get_hand_table():
+    """Per-process shared HandTable, built on first use if the file is missing or stale"""
+    global _table
+    if _table is None:
+        _table = HandTable()
+    return _table
+
+
+if __name__ == "__main__":
+    start = time.perf_counter()
+    table = HandTable(rebuild=False)
+    if table.file is None:
+        print(f"Building {DEFAULT_PATH} ...")
+        write_table(DEFAULT_PATH, build_table())
+        print(f"Built in {time.perf_counter() - start:.1f}s")
+        start = time.perf_counter()
+        table = HandTable()
+    print(f"Opened {ENTRY_COUNT} entries in {(time.perf_counter() - start) * 1000:.1f}ms")
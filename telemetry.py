@@ -0,0 +1,181 @@
+import json
+import mmap
+import os
+import queue
+import sys
+import threading
+import time
+from array import array
+
+SCHEMA_VERSION = 1
+EMPTY = 255  # Padding for unused card / joker slots
+
+# name -> (array typecode, numpy dtype, values per row)
+COLUMNS = [
+    ("run", "I", "<u4", 1),
+    ("seed", "q", "<i8", 1),
+    ("time", "d", "<f8", 1),
+    ("ante", "B", "<u1", 1),
+    ("ante_round", "B", "<u1", 1),
+    ("round", "H", "<u2", 1),
+    ("hand_type", "B", "<u1", 1),
+    ("cards", "B", "<u1", 5),
+    ("chips", "I", "<u4", 1),
+    ("mult", "d", "<f8", 1),
+    ("score", "q", "<i8", 1),
+    ("current_score", "q", "<i8", 1),
+    ("target_score", "q", "<i8", 1),
+    ("hands_remaining", "B", "<u1", 1),
+    ("jokers", "B", "<u1", 6),
+    ("money_before", "i", "<i4", 1),
+    ("money_after", "i", "<i4", 1),
+]
+
+for _name, _typecode, _dtype, _width in COLUMNS:
+    assert array(_typecode).itemsize == int(_dtype[2:]), f"Unexpected item size for {_name}"
+
+
+class TelemetrySink:
+    """Opt-in recorder of played hands, written as one fixed-width binary file per column.
+
+    The game thread only packs a tuple and puts it on a queue. A writer thread
+    collects rows into per-column arrays and appends them to <column>.bin one
+    block at a time, then rewrites schema.json with the new row count. Readers
+    can trust every row up to that count, e.g. with
+    numpy.memmap(path / "chips.bin", dtype="<u4", mode="r", shape=(rows,)).
+
+    The HandType and JokerType enums are passed in rather than imported so the
+    sink works with whichever copy of Main is running (script or module).
+    """
+
+    def __init__(self, path, hand_types, joker_types, block_rows=4096):
+        self.path = path
+        self.hand_types = list(hand_types)
+        self.joker_types = list(joker_types)
+        self.hand_type_codes = {hand_type: i for i, hand_type in enumerate(self.hand_types)}
+        self.joker_codes = {joker_type: i for i, joker_type in enumerate(self.joker_types)}
+        self.block_rows = block_rows
+        self.rows = 0
+        self.runs = 0
+        os.makedirs(path, exist_ok=True)
+        # A sink owns its directory, start from empty columns
+        for name, _, _, _ in COLUMNS:
+            open(self.column_path(name), "wb").close()
+        self.write_schema()
+
+        self.queue = queue.SimpleQueue()
+        self.thread = threading.Thread(target=self.writer_loop, name="telemetry-writer", daemon=True)
+        self.thread.start()
+
+    def column_path(self, name):
+        return os.path.join(self.path, name + ".bin")
+
+    def start_run(self):
+        """Return a new run number, call once per game"""
+        self.runs += 1
+        return self.runs - 1
+
+    def record_hand(self, game, run, cards, hand_type, chips, mult, score, money_before):
+        """Called from the game thread right after a hand is played"""
+        card_codes = [card.get_code() for card in cards[:5]]
+        joker_codes = [self.joker_codes[joker.type] for joker in game.jokers[:6]]
+        self.queue.put((
+            run,
+            -1 if game.seed is None else game.seed,
+            time.time(),
+            game.ante,
+            game.ante_round,
+            game.round,
+            self.hand_type_codes[hand_type],
+            card_codes + [EMPTY] * (5 - len(card_codes)),
+            int(chips),
+            float(mult),
+            score,
+            game.current_score,
+            game.target_score,
+            game.hands_remaining,
+            joker_codes + [EMPTY] * (6 - len(joker_codes)),
+            money_before,
+            game.money,
+        ))
+
+    def writer_loop(self):
+        buffers = [array(typecode) for _, typecode, _, _ in COLUMNS]
+        pending = 0
+        while True:
+            row = self.queue.get()
+            if row is None:
+                break
+            for buffer, (_, _, _, width), value in zip(buffers, COLUMNS, row):
+                if width == 1:
+                    buffer.append(value)
+                else:
+                    buffer.extend(value)
+            pending += 1
+            if pending >= self.block_rows:
+                self.flush_block(buffers, pending)
+                pending = 0
+        if pending:
+            self.flush_block(buffers, pending)
+
+    def flush_block(self, buffers, rows):
+        for buffer, (name, _, _, _) in zip(buffers, COLUMNS):
+            if sys.byteorder != "little":
+                buffer.byteswap()
+            with open(self.column_path(name), "ab") as f:
+                buffer.tofile(f)
+            del buffer[:]
+        self.rows += rows
+        self.write_schema()
+
+    def write_schema(self):
+        schema = {
+            "version": SCHEMA_VERSION,
+            "rows": self.rows,
+            "columns": [{"name": name, "dtype": dtype, "width": width} for name, _, dtype, width in COLUMNS],
+            "hand_types": [hand_type.label for hand_type in self.hand_types],
+            "jokers": [joker_type.value[0] for joker_type in self.joker_types],
+        }
+        tmp_path = os.path.join(self.path, "schema.json.tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(schema, f, indent=1)
+        os.replace(tmp_path, os.path.join(self.path, "schema.json"))
+
+    def close(self):
+        """Flush everything still queued and stop the writer thread"""
+        if self.thread.is_alive():
+            self.queue.put(None)
+            self.thread.join()
+
+
+class TelemetryReader:
+    """Read-only, memory-mapped view of a telemetry directory (no NumPy needed)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, "schema.json")) as f:
+            self.schema = json.load(f)
+        if self.schema["version"] != SCHEMA_VERSION:
+            raise ValueError(f"{path}: unsupported telemetry version {self.schema['version']}")
+        self.rows = self.schema["rows"]
+        self.columns = {column["name"]: column for column in self.schema["columns"]}
+        self.typecodes = {name: typecode for name, typecode, _, _ in COLUMNS}
+        self.maps = {}
+
+    def column(self, name):
+        """Return a flat memoryview over the column; multi-value columns are row-major.
+
+        Release the views before calling close().
+        """
+        if name not in self.maps:
+            with open(os.path.join(self.path, name + ".bin"), "rb") as f:
+                self.maps[name] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.rows else b""
+        itemsize = int(self.columns[name]["dtype"][2:])
+        size = self.rows * self.columns[name]["width"] * itemsize
+        return memoryview(self.maps[name])[:size].cast(self.typecodes[name])
+
+    def close(self):
+        for data in self.maps.values():
+            if isinstance(data, mmap.mmap):
+                data.close()
+        self.maps = {}
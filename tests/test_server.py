@@ -0,0 +1,69 @@
+import asyncio
+import json
+import os
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+from Main import DeckSpec, Game
+from server import GameServer, restore_game, snapshot_game
+
+
+class FakeWriter:
+    def __init__(self):
+        self.lines = []
+
+    def write(self, data):
+        self.lines.extend(json.loads(line) for line in data.decode().splitlines())
+
+    async def drain(self):
+        pass
+
+    def close(self):
+        pass
+
+
+def run_requests(*requests):
+    """Send requests down one connection, returns the replies"""
+    async def talk():
+        reader = asyncio.StreamReader()
+        for request in requests:
+            reader.feed_data(json.dumps(request).encode() + b"\n")
+        reader.feed_eof()
+        writer = FakeWriter()
+        await GameServer().handle_client(reader, writer)
+        return writer.lines
+    return asyncio.run(talk())
+
+
+def test_bad_seed_keeps_connection():
+    replies = run_requests({"action": "new", "seed": [1]}, {"action": "new", "seed": 1})
+    assert replies[0] == {"ok": False, "error": "bad request: seed must be an integer"}
+    assert replies[1]["ok"]
+
+
+def test_bad_session_keeps_connection():
+    replies = run_requests({"session": [1], "action": "play"}, {"action": "new"})
+    assert replies[0] == {"ok": False, "error": "bad request: session must be a string"}
+    assert replies[1]["ok"]
+
+
+def test_abandoned_sessions_expire():
+    server = GameServer(idle_timeout=-1.0, session_ttl=60.0)
+    session_id = server.handle_request({"action": "new", "seed": 1})["session"]
+    server.evict_idle()
+    assert session_id in server.evicted
+    assert server.handle_request({"session": session_id, "action": "state"})["ok"]
+
+    server.evict_idle()
+    evicted_at, snapshot = server.evicted[session_id]
+    server.evicted[session_id] = (evicted_at - 61.0, snapshot)
+    server.evict_idle()
+    assert session_id not in server.evicted
+    assert server.handle_request({"session": session_id, "action": "state"})["error"] == "unknown session"
+
+
+def test_snapshot_keeps_deck_spec():
+    game = Game(seed=3, headless=True, deck_spec=DeckSpec.from_args(2, "2,3", "stars"))
+    restored = restore_game(json.loads(json.dumps(snapshot_game(game))))
+    assert restored.deck_spec.to_args() == game.deck_spec.to_args()
+    assert [card.get_code() for card in restored.deck] == [card.get_code() for card in game.deck]
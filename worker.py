@@ -0,0 +1,60 @@
+import queue
+import threading
+
+import pygame
+
+# Posted to the pygame queue with kind, generation, result and error attributes
+WORKER_RESULT = pygame.event.custom_type()
+
+
+class BackgroundWorker:
+    """Runs slow calculations off the main thread and posts the results as pygame events.
+
+    Every job has a kind (e.g. "advice"). Submitting a job supersedes
+    the older ones of the same kind: a superseded job still waiting is
+    skipped, and the result of one already running is posted but no longer
+    current, see is_current(). Jobs must only use the arguments they are
+    given, never the live game state.
+    """
+
+    def __init__(self):
+        self.jobs = queue.SimpleQueue()
+        self.generations = {}
+        self.lock = threading.Lock()
+        self.thread = threading.Thread(target=self.work, name="BackgroundWorker", daemon=True)
+        self.thread.start()
+
+    def submit(self, kind, func, *args):
+        with self.lock:
+            generation = self.generations[kind] = self.generations.get(kind, 0) + 1
+        self.jobs.put((kind, generation, func, args))
+
+    def cancel(self, kind=None):
+        """Make pending results of one kind (or every kind) stale"""
+        with self.lock:
+            for name in [kind] if kind is not None else list(self.generations):
+                self.generations[name] = self.generations.get(name, 0) + 1
+
+    def is_current(self, kind, generation):
+        with self.lock:
+            return self.generations.get(kind) == generation
+
+    def work(self):
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            kind, generation, func, args = job
+            if not self.is_current(kind, generation):
+                continue
+            result = error = None
+            try:
+                result = func(*args)
+            except Exception as e:
+                error = e  # Reported on the main thread
+            pygame.event.post(pygame.event.Event(
+                WORKER_RESULT, kind=kind, generation=generation, result=result, error=error))
+
+    def close(self):
+        self.jobs.put(None)
+        self.thread.join()